@@ -0,0 +1 @@
+# Algoritmos de resolución de Nut Sort
@@ -0,0 +1,10 @@
+# Módulo Backtracking
+
+from .core import State, MAX_CAP, solve_backtracking
+from .utils import (
+    validar_instancia_inicial,
+    generar_estado_aleatorio_unico,
+    dibujar_estado,
+    reconstruir_y_mostrar,
+    estado_a_string,
+)
@@ -12,8 +12,12 @@
 # ============================================================
 
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Tuple, List, Optional, Set
+from functools import lru_cache
+from heapq import heapify, heappop, heappush
+from typing import Tuple, List, Optional, Set, Dict, Callable, Iterator
+import multiprocessing
 
 # ============================================================
 # DEFINICIONES BÁSICAS DEL PROBLEMA
@@ -24,6 +28,8 @@ MAX_CAP = 5
 
 # Tipos de datos básicos
 Color = str               # Representa un color (ej: "R", "G", "Y", "B", "O")
+                          # (internamente el solver usa enteros 1..15, ver
+                          # codificar_estado/decodificar_estado)
 Pile  = Tuple[Color, ...] # Una pila = tupla de colores (de abajo hacia arriba)
 State = Tuple[Pile, ...]  # Estado completo = tupla de todas las pilas
 
@@ -31,6 +37,16 @@ State = Tuple[Pile, ...]  # Estado completo = tupla de todas las pilas
 # FUNCIONES PRIMITIVAS: Operaciones básicas sobre pilas
 # ============================================================
 
+# Pilas terminadas de referencia por color: ("R","R","R","R","R"), etc.
+# Comparar contra ellas con == recorre la tupla en C (y corta en la
+# primera diferencia) en lugar de un generador all(...) en Python.
+# Los colores llegan del cliente, así que la caché está acotada.
+@lru_cache(maxsize=1024)
+def _pila_llena(c: Color) -> Pile:
+    """Retorna la pila de referencia con MAX_CAP tuercas de color c."""
+    return (c,) * MAX_CAP
+
+
 def top(p: Pile) -> Optional[Color]:
     """
     Devuelve el color del tope (parte superior) de la pila.
@@ -99,8 +115,8 @@ def pila_es_monocolor(p: Pile) -> bool:
     if len(p) <= 1:
         return True
     
-    # Verificar que todos sean iguales al primero
-    return all(x == p[0] for x in p)
+    # Verificar que todos sean iguales al primero (conteo en C)
+    return p.count(p[0]) == len(p)
 
 
 def pila_terminada(p: Pile) -> bool:
@@ -124,7 +140,7 @@ def pila_terminada(p: Pile) -> bool:
     """
     # Solo los pernos con 5 tuercas del mismo color están terminados
     if len(p) == MAX_CAP:
-        return all(x == p[0] for x in p)
+        return p == _pila_llena(p[0])
     
     # Cualquier otro caso (incluyendo vacíos) no está terminado
     return False
@@ -149,7 +165,7 @@ def is_goal(s: State) -> bool:
         # Un perno está en objetivo si está vacío O tiene 5 tuercas del mismo color
         if len(p) == 0:
             continue  # Vacío está bien (perno terminado sin tuercas)
-        elif len(p) == MAX_CAP and all(x == p[0] for x in p):
+        elif len(p) == MAX_CAP and p == _pila_llena(p[0]):
             continue  # 5 tuercas del mismo color está bien (perno terminado completo)
         else:
             return False  # Si no cumple ninguna condición, no es objetivo
@@ -255,11 +271,214 @@ def aplicar_movimiento(s: State, i: int, j: int) -> State:
     return tuple(nuevo)  # Retornar como tupla (inmutable)
 
 
+# ============================================================
+# REPRESENTACIÓN EMPAQUETADA (uso interno del solver)
+# ============================================================
+# Durante la búsqueda cada pila se guarda como un único entero:
+#
+#     bits 0-2  -> cantidad de tuercas (0..MAX_CAP)
+#     bits 3-6  -> color de la tuerca 0 (base)
+#     bits 7-10 -> color de la tuerca 1
+#     ...
+#
+# Cada color se codifica con 4 bits (1..15, el 0 queda libre), así
+# que una pila entra en 23 bits y el estado completo es una tupla de
+# enteros chicos. Mover una tuerca son un par de shifts/máscaras y el
+# hash del estado (para `visited`) ya no recorre tuerca por tuerca.
+
+PackedPile  = int                    # Pila empaquetada (ver esquema arriba)
+PackedState = Tuple[PackedPile, ...] # Estado empaquetado
+
+BITS_LARGO = 3
+BITS_COLOR = 4
+MASCARA_LARGO = (1 << BITS_LARGO) - 1
+MASCARA_COLOR = (1 << BITS_COLOR) - 1
+MAX_COLORES = MASCARA_COLOR          # 15 colores distintos como máximo
+BITS_PILA = BITS_LARGO + BITS_COLOR * MAX_CAP  # 23 bits por pila
+
+
+def _desplazamiento(k: int) -> int:
+    """Posición (en bits) del color de la tuerca k dentro de la pila."""
+    return BITS_LARGO + BITS_COLOR * k
+
+
+# Pilas terminadas posibles: MAX_CAP tuercas de un mismo color
+_PILAS_TERMINADAS = frozenset(
+    sum(c << _desplazamiento(k) for k in range(MAX_CAP)) | MAX_CAP
+    for c in range(1, MAX_COLORES + 1)
+)
+
+
+def codificar_estado(s: State) -> Tuple[PackedState, Tuple[Color, ...]]:
+    """
+    Convierte un estado de tuplas de colores a su forma empaquetada.
+    
+    Los colores se numeran 1, 2, 3... en el orden en que aparecen.
+    Retorna (estado_empaquetado, colores) donde colores[k-1] es el
+    color representado por el número k.
+    
+    Lanza ValueError si hay más de MAX_COLORES colores o alguna pila
+    supera MAX_CAP tuercas.
+    """
+    indices = {}
+    pilas = []
+    for k, p in enumerate(s):
+        if len(p) > MAX_CAP:
+            raise ValueError(f"Pila P{k} excede capacidad máxima {MAX_CAP}")
+        valor = len(p)
+        for pos, color in enumerate(p):
+            if color not in indices:
+                if len(indices) >= MAX_COLORES:
+                    raise ValueError(f"Se admiten como máximo {MAX_COLORES} colores distintos")
+                indices[color] = len(indices) + 1
+            valor |= indices[color] << _desplazamiento(pos)
+        pilas.append(valor)
+    return tuple(pilas), tuple(indices)
+
+
+def decodificar_estado(s: PackedState, colores: Tuple[Color, ...]) -> State:
+    """
+    Inversa de codificar_estado: reconstruye el estado de tuplas de
+    colores a partir de la forma empaquetada y la tabla `colores`.
+    """
+    return tuple(
+        tuple(colores[(p >> _desplazamiento(k) & MASCARA_COLOR) - 1]
+              for k in range(p & MASCARA_LARGO))
+        for p in s
+    )
+
+
+def _largo(p: PackedPile) -> int:
+    """Cantidad de tuercas de una pila empaquetada."""
+    return p & MASCARA_LARGO
+
+
+def _tope(p: PackedPile) -> int:
+    """Color del tope de una pila empaquetada (0 si está vacía)."""
+    n = p & MASCARA_LARGO
+    if not n:
+        return 0
+    return (p >> _desplazamiento(n - 1)) & MASCARA_COLOR
+
+
+def _racha_superior(p: PackedPile) -> int:
+    """Equivalente empaquetado de run_len_superior."""
+    n = p & MASCARA_LARGO
+    if not n:
+        return 0
+    c = (p >> _desplazamiento(n - 1)) & MASCARA_COLOR
+    k = 1
+    while k < n and (p >> _desplazamiento(n - 1 - k)) & MASCARA_COLOR == c:
+        k += 1
+    return k
+
+
+# Datos derivados de cada pila: (largo, tope, racha_superior).
+# Las pilas se repiten muchísimo durante la búsqueda, así que cada una
+# se analiza una sola vez y después es una consulta a la caché (acotada
+# como _prioridad_movimiento, porque vive tanto como el proceso).
+@lru_cache(maxsize=200_000)
+def _datos(p: PackedPile) -> Tuple[int, int, int]:
+    """Retorna (largo, tope, racha_superior) de la pila."""
+    return p & MASCARA_LARGO, _tope(p), _racha_superior(p)
+
+
+# Acotada como _prioridad_movimiento: la tabla vive tanto como el proceso
+# (en el servidor, entre todas las búsquedas)
+@lru_cache(maxsize=200_000)
+def _racha_base(p: PackedPile) -> Tuple[int, int]:
+    """
+    Retorna (color_base, racha_base): el color de la tuerca de abajo y
+    cuántas tuercas consecutivas de ese color hay desde la base.
+    Para una pila vacía retorna (0, 0).
+    """
+    n = p & MASCARA_LARGO
+    if not n:
+        return 0, 0
+    c = (p >> _desplazamiento(0)) & MASCARA_COLOR
+    k = 1
+    while k < n and (p >> _desplazamiento(k)) & MASCARA_COLOR == c:
+        k += 1
+    return c, k
+
+
+def _terminada(p: PackedPile) -> bool:
+    """Equivalente empaquetado de pila_terminada."""
+    return p in _PILAS_TERMINADAS
+
+
+def _clave(s: PackedState) -> int:
+    """
+    Huella exacta del estado para el conjunto de visitados: las pilas
+    concatenadas en un único entero (la pila k ocupa los bits desde
+    BITS_PILA * k).
+    
+    Un entero ocupa bastante menos memoria que la tupla de pilas y,
+    a diferencia de un hash, no tiene colisiones. Además se puede
+    actualizar en O(1) al mover (ver _dfs): solo cambian dos pilas.
+    """
+    k = 0
+    for idx, p in enumerate(s):
+        k |= p << (BITS_PILA * idx)
+    return k
+
+
+def _clave_canonica(s: PackedState) -> int:
+    """
+    Huella de un estado independiente del orden de sus pilas.
+    
+    Dos estados que difieren solo en una permutación de pilas (p.ej. dos
+    pilas vacías intercambiadas) son equivalentes: cualquier solución de
+    uno se traduce a la del otro renombrando índices. Ordenar las pilas
+    antes de armar la huella los une en una sola entrada de `visited`.
+    """
+    h = 0
+    for p in sorted(s):
+        h = h << BITS_PILA | p
+    return h
+
+
+def _es_objetivo(s: PackedState) -> bool:
+    """Equivalente empaquetado de is_goal: cada pila vacía o terminada."""
+    return _pendientes(s) == 0
+
+
+def _pendientes(s: PackedState) -> int:
+    """
+    Cantidad de pilas que todavía impiden el objetivo (ni vacías ni
+    terminadas). El estado es objetivo cuando vale 0.
+    """
+    return sum(1 for p in s if p and p not in _PILAS_TERMINADAS)
+
+
+def _apilar(p: PackedPile, c: int) -> PackedPile:
+    """Agrega una tuerca de color c sobre la pila p (sin validar)."""
+    return (p | (c << _desplazamiento(p & MASCARA_LARGO))) + 1
+
+
+def _aplicar(s: PackedState, i: int, j: int) -> PackedState:
+    """
+    Mueve el tope de la pila i hacia la pila j en un estado empaquetado.
+    
+    No valida el movimiento: generar_movimientos_ordenados solo produce
+    movimientos legales. Para uso externo está aplicar_movimiento.
+    """
+    src, dst = s[i], s[j]
+    corte = _desplazamiento((src & MASCARA_LARGO) - 1)
+    c = (src >> corte) & MASCARA_COLOR
+    nuevo_src = (src & ((1 << corte) - 1)) - 1  # quitar tope y restar 1 al largo
+    nuevo_dst = _apilar(dst, c)
+    if i < j:
+        return s[:i] + (nuevo_src,) + s[i+1:j] + (nuevo_dst,) + s[j+1:]
+    return s[:j] + (nuevo_dst,) + s[j+1:i] + (nuevo_src,) + s[i+1:]
+
+
 # ============================================================
 # HEURÍSTICA H1: Selección de Color Foco
 # ============================================================
 # Idea: Priorizar movimientos que involucren el color más frecuente
 # en los topes. Esto ayuda a consolidar colores más rápido.
+# Las heurísticas trabajan sobre el estado empaquetado del solver.
 
 def freq_topes(s: State) -> Counter:
     """
@@ -267,11 +486,12 @@ def freq_topes(s: State) -> Counter:
     
     Esto nos ayuda a identificar qué color debería ser nuestra prioridad.
     Si un color aparece muchas veces arriba, tiene más potencial para
-    consolidarse.
+    consolidarse. (La búsqueda usa la versión empaquetada dentro de
+    elegir_color_foco; esta opera sobre el State público.)
     
     Ejemplo:
         Estado: (("R", "G"), ("R", "Y"), ("G",))
-        freq_topes -> Counter({"R": 2, "G": 1, "Y": 1})
+        freq_topes -> Counter({"G": 2, "Y": 1})
     """
     cnt = Counter()
     for p in s:
@@ -314,15 +534,41 @@ def elegir_color_foco(s: State) -> Optional[Color]:
     
     Retorna None si no hay ningún tope (todas las pilas vacías).
     """
-    ft = freq_topes(s)
-    if not ft:
-        return None
-    
-    br = max_run_por_color(s)
+    empaquetado, colores = codificar_estado(s)
+    foco = _elegir_color_foco(empaquetado)
+    return colores[foco - 1] if foco is not None else None
+
+
+def _elegir_color_foco(s: PackedState) -> Optional[int]:
+    """
+    elegir_color_foco sobre el estado empaquetado (retorna el número de
+    color). Calcula lo mismo que freq_topes y max_run_por_color, pero en una
+    sola pasada y con listas fijas indexadas por color (los colores
+    empaquetados son 1..MAX_COLORES) en lugar de Counter/dict.
+    """
+    freq = [0] * (MAX_COLORES + 1)
+    best = [0] * (MAX_COLORES + 1)
+    orden = []  # colores en el orden en que aparecen en los topes
+    datos = _datos
+    for p in s:
+        if not p:
+            continue
+        _, c, r = datos(p)
+        if not freq[c]:
+            orden.append(c)
+        freq[c] += 1
+        if r > best[c]:
+            best[c] = r
     
-    # Elegir el color con mayor frecuencia, y si hay empate,
-    # el que tenga la racha más larga
-    return max(ft.keys(), key=lambda c: (ft[c], br.get(c, 0)))
+    # Elegir el color con mayor frecuencia, y si hay empate, el que
+    # tenga la racha más larga (ante empate total, el primero en aparecer)
+    foco = None
+    mejor = (0, 0)
+    for c in orden:
+        clave = (freq[c], best[c])
+        if clave > mejor:
+            foco, mejor = c, clave
+    return foco
 
 
 # ============================================================
@@ -350,27 +596,34 @@ def priority_tuple(s: State, i: int, j: int) -> tuple:
         priority_tuple(estado, 0, 1) -> (0, -3, -2, 0, 2, 0)
         (mejor que uno que retorne (1, -1, -1, 1, 3, 1))
     """
-    p_src, p_dst = s[i], s[j]
-    c = top(p_src)
+    empaquetado, _ = codificar_estado(s)
+    return _componentes_prioridad(empaquetado[i], empaquetado[j], j == len(s) - 1)
+
+
+def _componentes_prioridad(p_src: PackedPile, p_dst: PackedPile, es_buffer: bool) -> tuple:
+    """
+    Cuerpo de priority_tuple: la prioridad depende solo de las dos pilas
+    involucradas y de si el destino es el buffer.
+    """
+    len_src, c, run_before = _datos(p_src)  # run_before: racha antes
     
     # Defensivo: no debería pasar si se verifica con puede_mover primero
-    if c is None:
+    if not c:
         return (999, 0, 0, 0, 0, 0)  # Prioridad muy baja
     
     # Análisis del movimiento
-    same_color = (bool(p_dst) and top(p_dst) == c)  # ¿Consolida?
-    run_after = run_len_superior(tuple(list(p_dst) + [c]))  # Ra cha después
-    run_before = run_len_superior(p_src)  # Rach a antes
-    dest_empty = (len(p_dst) == 0)  # ¿Buffer?
-    dest_free = free_slots(p_dst)  # Espacios libres
-    break_pure = (len(p_src) > 1 and all(x == p_src[0] for x in p_src))  # ¿Rompe pura?
+    len_dst, tope_dst, run_dst = _datos(p_dst)
+    same_color = (len_dst > 0 and tope_dst == c)  # ¿Consolida?
+    # Racha después: si consolida se suma a la racha del destino,
+    # si no, la tuerca movida queda sola arriba
+    run_after = run_dst + 1 if same_color else 1
+    dest_empty = (len_dst == 0)  # ¿Buffer?
+    dest_free = MAX_CAP - len_dst  # Espacios libres
+    break_pure = (len_src > 1 and run_before == len_src)  # ¿Rompe pura?
     
     # Calcular espacios libres DESPUÉS del movimiento
     espacios_despues = dest_free - 1 if not dest_empty else MAX_CAP - 1
     
-    # Detectar si el destino es buffer (última pila)
-    es_buffer = (j == len(s) - 1)
-    
     # REGLA MEJORADA: Preferir buffer cuando consolidamos
     # para no contaminar pilas de trabajo innecesariamente
     preferir_buffer = 1  # Por defecto, no preferir buffer
@@ -391,6 +644,39 @@ def priority_tuple(s: State, i: int, j: int) -> tuple:
     )
 
 
+# Para ordenar, la tupla de prioridad se empaqueta en un único entero
+# (el componente más importante en los bits altos): comparar dos
+# enteros es mucho más barato que comparar tuplas elemento a elemento.
+# Cada componente se desplaza a un rango no negativo de ancho fijo:
+#   (ancho en bits, valor mínimo del componente)
+_CAMPOS_PRIORIDAD = (
+    (1, 0),             # (1) consolida
+    (1, 0),             # (2) preferir buffer
+    (3, -MAX_CAP),      # (3) -run_after
+    (3, -MAX_CAP),      # (4) -run_before
+    (1, 0),             # (5) destino vacío
+    (3, -(MAX_CAP - 1)),  # (6) -espacios_despues
+    (1, 0),             # (7) rompe pila pura
+)
+_BITS_PRIORIDAD = sum(ancho for ancho, _ in _CAMPOS_PRIORIDAD)
+
+
+@lru_cache(maxsize=200_000)
+def _prioridad_movimiento(p_src: PackedPile, p_dst: PackedPile, es_buffer: bool) -> int:
+    """
+    priority_tuple empaquetada en un entero con el mismo orden. Los
+    mismos pares de pilas se repiten en muchísimos nodos, así que el
+    resultado se memoriza.
+    """
+    componentes = _componentes_prioridad(p_src, p_dst, es_buffer)
+    if componentes[0] == 999:
+        return 1 << _BITS_PRIORIDAD  # Peor que cualquier movimiento real
+    valor = 0
+    for (ancho, minimo), x in zip(_CAMPOS_PRIORIDAD, componentes):
+        valor = (valor << ancho) | (x - minimo)
+    return valor
+
+
 # ============================================================
 # GENERACIÓN DE MOVIMIENTOS ORDENADOS
 # ============================================================
@@ -414,40 +700,93 @@ def generar_movimientos_ordenados(s: State) -> List[tuple]:
     
     Retorna lista de tuplas (i, j) representando movimientos i -> j.
     """
+    return _generar_movimientos_ordenados(codificar_estado(s)[0])
+
+
+def _generar_movimientos_ordenados(s: PackedState) -> List[tuple]:
+    """generar_movimientos_ordenados sobre el estado empaquetado."""
+    return list(_movimientos_perezosos(s))
+
+
+def _movimientos_perezosos(s: PackedState) -> Iterator[tuple]:
+    """
+    Igual que _generar_movimientos_ordenados, pero entrega los movimientos
+    de a uno y a demanda.
+    
+    Cada grupo se arma como heap (heapify es O(n)) y se extrae con
+    heappop solo cuando la DFS pide el siguiente movimiento: si el primer
+    movimiento ya lleva a la solución, el resto nunca se ordena. El
+    desempate por (i, j) reproduce exactamente el orden del sort estable.
+    """
     N = len(s)
-    foco = elegir_color_foco(s)
+    foco = _elegir_color_foco(s)
     
-    # Separar movimientos en dos grupos
+    # Datos de cada pila calculados UNA vez por estado (no N² veces)
+    terminada = [p in _PILAS_TERMINADAS for p in s]
+    largos = [p & MASCARA_LARGO for p in s]
+    tops = [_tope(p) for p in s]
+    ultimo = N - 1  # índice del buffer
+    
+    # Separar movimientos en dos grupos de (prioridad, movimiento)
     grupo_foco = []      # Movimientos que involucran el color foco
     grupo_otros = []     # Otros movimientos
     
     # Generar todos los movimientos posibles
     for i in range(N):
-        # EXCLUIR pilas terminadas como origen
-        if pila_terminada(s[i]):
+        # EXCLUIR pilas terminadas como origen (y vacías: no hay qué mover)
+        if terminada[i] or not largos[i]:
             continue
         
+        # Clasificar según si involucra el color foco
+        c = tops[i]
+        grupo = grupo_foco if (foco is not None and c == foco) else grupo_otros
+        p_src = s[i]
+        
         for j in range(N):
-            if i == j:  # No podemos mover de una pila a sí misma
+            # No mover a sí misma ni hacia pilas terminadas
+            if i == j or terminada[j]:
                 continue
             
-            # EXCLUIR pilas terminadas como destino
-            if pila_terminada(s[j]):
-                continue
-            
-            if puede_mover(s[i], s[j]):  # Verificar que sea legal
-                # Clasificar según si involucra el color foco
-                if foco is not None and s[i] and top(s[i]) == foco:
-                    grupo_foco.append((i, j))
-                else:
-                    grupo_otros.append((i, j))
+            # Reglas de puede_mover: destino vacío, o con lugar y mismo tope
+            if not largos[j] or (largos[j] < MAX_CAP and tops[j] == c):
+                grupo.append((_prioridad_movimiento(p_src, s[j], j == ultimo), (i, j)))
+    
+    # Primero los del color foco (más importantes), cada grupo de menor
+    # a mayor prioridad (tupla más pequeña = mejor)
+    for grupo in (grupo_foco, grupo_otros):
+        heapify(grupo)
+        while grupo:
+            yield heappop(grupo)[1]
+
+
+# ============================================================
+# COTA INFERIOR (para mejorar soluciones)
+# ============================================================
+
+def cota_inferior(s: PackedState) -> int:
+    """
+    Cota inferior admisible de los movimientos que faltan para resolver s.
+    
+    Las únicas tuercas que pueden no moverse nunca son las que ya están
+    en la base de la pila donde terminará su color. Para cada color se
+    toma la racha de base más larga entre todas las pilas; cualquier
+    otra tuerca de ese color necesita al menos un movimiento:
     
-    # Ordenar cada grupo por prioridad (tupla más pequeña = mejor)
-    grupo_foco.sort(key=lambda mv: priority_tuple(s, *mv))
-    grupo_otros.sort(key=lambda mv: priority_tuple(s, *mv))
+        cota = total_tuercas - suma(mejor racha de base de cada color)
     
-    # Retornar: primero los del color foco (más importantes)
-    return grupo_foco + grupo_otros
+    Ejemplo:
+        (("R","R","G"), ("G","R"), ()) -> 5 - (2 + 1) = 2
+    """
+    mejor = {}
+    total = 0
+    for p in s:
+        n = p & MASCARA_LARGO
+        if n:
+            total += n
+            c, r = _racha_base(p)
+            if r > mejor.get(c, 0):
+                mejor[c] = r
+    return total - sum(mejor.values())
 
 
 # ============================================================
@@ -456,7 +795,7 @@ def generar_movimientos_ordenados(s: State) -> List[tuple]:
 # Este es el corazón del algoritmo. Usa búsqueda en profundidad
 # con backtracking para encontrar una solución.
 
-@dataclass
+@dataclass(slots=True)
 class SearchStats:
     """
     Estadísticas de la búsqueda.
@@ -467,93 +806,353 @@ class SearchStats:
     max_depth: int = 0
 
 
-def solve_backtracking(start: State, max_expansions: Optional[int] = None) -> Tuple[Optional[List[tuple]], SearchStats]:
+def solve_backtracking(
+    start: State,
+    max_expansions: Optional[int] = None,
+    procesos: int = 1,
+    mejorar: bool = False,
+    simetrias: bool = False,
+    a_estrella: bool = False
+) -> Tuple[Optional[List[tuple]], SearchStats]:
     """
     Resuelve el problema usando backtracking con DFS (búsqueda en profundidad).
     
     Estrategia:
     1. Mantener un conjunto de estados visitados (para evitar ciclos)
-    2. Usar recursión para explorar el árbol de estados
+    2. Explorar el árbol de estados en profundidad con una pila explícita
     3. En cada estado, generar movimientos ordenados por heurísticas
     4. Probar cada movimiento (backtrack si no lleva a solución)
     5. Evitar movimientos reversos inmediatos (i->j luego j->i)
     
+    Internamente la búsqueda trabaja sobre el estado empaquetado
+    (ver codificar_estado); los movimientos retornados usan los mismos
+    índices de pila que `start`.
+    
     Parámetros:
         start: Estado inicial
         max_expansions: Límite opcional de estados a expandir (para evitar loops infinitos)
+        procesos: Si es mayor a 1, cada primer movimiento se explora en un
+                  proceso aparte (ver _solve_paralelo). Por defecto la
+                  búsqueda es secuencial y determinística.
+        mejorar: Si es True (solo en modo secuencial), después de la primera
+                 solución repite la DFS podando con cota_inferior los nodos
+                 que no pueden mejorarla, hasta que no aparezca una más
+                 corta o se agote max_expansions (compartido entre rondas).
+                 Acorta la solución pero no garantiza la óptima, porque
+                 `visited` descarta estados ya alcanzados por otro camino.
+        simetrias: Si es True, `visited` identifica los estados que solo
+                   difieren en el orden de sus pilas (ver _clave_canonica).
+                   Suele expandir menos estados, pero la solución hallada
+                   puede ser distinta a la de la búsqueda por defecto.
+        a_estrella: Si es True (solo en modo secuencial), reemplaza la DFS
+                    por una búsqueda mejor-primero (ver _a_estrella). Usa
+                    más memoria, pero la solución es la más corta posible
+                    (si no se agota max_expansions); `mejorar` no aplica.
     
     Retorna:
         (solucion, stats) donde:
         - solucion: Lista de movimientos (i, j) que llevan a la solución, o None si no hay
         - stats: Estadísticas de la búsqueda
     """
-    # Conjunto de estados ya visitados (evita ciclos)
-    visited: Set[State] = {start}
+    inicial, _ = codificar_estado(start)
+    
+    if procesos > 1:
+        return _solve_paralelo(inicial, max_expansions, procesos, simetrias)
+    
+    if a_estrella:
+        return _a_estrella(inicial, max_expansions, simetrias)
+    
+    clave = _clave_canonica if simetrias else _clave
+    
+    # Huellas de los estados ya visitados (evita ciclos)
+    visited: Set[int] = {clave(inicial)}
     stats = SearchStats()
+    solucion = _dfs(inicial, [], None, visited, stats, max_expansions,
+                    simetrias=simetrias)
+    
+    # Mejora opcional: buscar soluciones estrictamente más cortas
+    while mejorar and solucion:
+        mas_corta = _dfs(inicial, [], None, {clave(inicial)}, stats, max_expansions,
+                         cota=len(solucion), simetrias=simetrias)
+        if mas_corta is None:
+            break
+        solucion = mas_corta
+    
+    return solucion, stats
 
-    def dfs(s: State, path: List[tuple], last_move: Optional[tuple]) -> Optional[List[tuple]]:
-        """
-        Función recursiva de búsqueda en profundidad.
-        
-        Parámetros:
-            s: Estado actual
-            path: Secuencia de movimientos desde el inicio hasta s
-            last_move: Último movimiento realizado (para evitar reversos)
-        
-        Retorna:
-            Lista de movimientos solución, o None si no hay solución desde aquí
-        """
-        # Incrementar contador de expansiones
+
+def _dfs(
+    inicial: PackedState,
+    path: List[tuple],
+    last_move: Optional[tuple],
+    visited: Set[int],
+    stats: SearchStats,
+    max_expansions: Optional[int],
+    cancelado: Optional[Callable[[], bool]] = None,
+    cota: Optional[int] = None,
+    simetrias: bool = False
+) -> Optional[List[tuple]]:
+    """
+    Búsqueda en profundidad desde `inicial`.
+    
+    Parámetros:
+        inicial: Estado (empaquetado) desde el que se busca
+        path: Movimientos que llevaron hasta `inicial` (se extiende in situ)
+        last_move: Último movimiento realizado (para evitar reversos)
+        visited: Huellas de estados ya visitados (se actualiza in situ)
+        stats: Estadísticas a acumular
+        max_expansions: Límite opcional de estados a expandir
+        cancelado: Función opcional que, si retorna True, corta la búsqueda
+                   (se consulta cada 1024 expansiones)
+        cota: Si se indica, solo se buscan soluciones de menos de `cota`
+              movimientos (poda con cota_inferior)
+        simetrias: Si es True, `visited` guarda huellas canónicas
+                   (_clave_canonica) en lugar de las posicionales
+    
+    Retorna la lista de movimientos solución, o None si no hay.
+    """
+    # La DFS usa una pila explícita en lugar de recursión: cada marco
+    # guarda (estado, iterador de movimientos pendientes, movimientos
+    # prohibidos por llevar de vuelta a un ancestro).
+    # `path` se modifica con append/pop en paralelo a la pila de marcos,
+    # así que nunca se copia mientras se busca.
+    #
+    # Cada marco lleva también la huella del estado, que se actualiza
+    # con dos XOR por movimiento en lugar de recalcularse completa, y la
+    # cantidad de pilas pendientes (ver _pendientes): un movimiento solo
+    # cambia las pilas i y j, así que el test de objetivo no recorre
+    # todo el estado.
+    pila: List[tuple] = []
+    s, h, pend = inicial, _clave(inicial), _pendientes(inicial)
+    terminadas = _PILAS_TERMINADAS
+    desplazamientos = [BITS_PILA * k for k in range(len(inicial))]
+    
+    while True:
+        # --- "Entrar" al estado s (equivale a una llamada recursiva) ---
         stats.expanded += 1
-        stats.max_depth = max(stats.max_depth, len(path))
+        if len(path) > stats.max_depth:
+            stats.max_depth = len(path)
+        
+        if cancelado is not None and not stats.expanded & 1023 and cancelado():
+            return None
         
         # Verificar límite de expansiones (safety check)
         if max_expansions and stats.expanded >= max_expansions:
+            if pila:
+                path.pop()  # Este estado no se explora: volver al padre
+        # CASO BASE: ¿Hemos alcanzado el objetivo?
+        elif not pend:
+            return list(path)  # ¡Solución encontrada!
+        else:
+            # Movimientos que vuelven a un estado del camino actual (y que
+            # `visited` descartaría de todos modos), detectados sin
+            # aplicar el movimiento ni calcular la huella:
+            # - el reverso del último movimiento (a->b seguido de b->a)
+            # - si los dos últimos movieron la misma tuerca (a->b, b->c),
+            #   devolverla a su pila original (c->a) restaura el abuelo
+            prohibidos = ()
+            if last_move:
+                b, c = last_move
+                prohibidos = ((c, b),)
+                if len(path) > 1 and path[-2][1] == b:
+                    prohibidos = ((c, b), (c, path[-2][0]))
+            
+            # Obtener movimientos legales ordenados por heurísticas
+            pila.append((s, h, pend, _movimientos_perezosos(s), prohibidos))
+        
+        # --- Buscar el próximo hijo a explorar (backtrack si hace falta) ---
+        while pila:
+            s, h, pend, moves, prohibidos = pila[-1]
+            for mov in moves:
+                # Evitar movimientos reversos (optimización): si acabamos
+                # de hacer j->i, no hacer i->j inmediatamente
+                if mov in prohibidos:
+                    continue
+                i, j = mov
+                
+                # Aplicar el movimiento para obtener nuevo estado (sin
+                # revalidar: los movimientos se generaron para este mismo s)
+                nuevo_estado = _aplicar(s, i, j)
+                
+                # PODA: este camino ya no puede mejorar la cota
+                if cota is not None and len(path) + 1 + cota_inferior(nuevo_estado) >= cota:
+                    continue
+                
+                # Evitar ciclos: si ya visitamos este estado, saltarlo
+                if simetrias:
+                    clave = _clave_canonica(nuevo_estado)
+                else:
+                    clave = (h ^ ((s[i] ^ nuevo_estado[i]) << desplazamientos[i])
+                               ^ ((s[j] ^ nuevo_estado[j]) << desplazamientos[j]))
+                if clave in visited:
+                    continue
+                
+                # Marcar como visitado y descender
+                visited.add(clave)
+                path.append(mov)  # misma tupla generada, sin copiar
+                src, dst = nuevo_estado[i], nuevo_estado[j]
+                pend += (bool(src and src not in terminadas)
+                         + bool(dst not in terminadas)
+                         - bool(s[i] not in terminadas)
+                         - bool(s[j] and s[j] not in terminadas))
+                s, h, last_move = nuevo_estado, clave, mov
+                break
+            else:
+                # Ningún movimiento llevó a solución: backtrack
+                pila.pop()
+                if pila:
+                    path.pop()
+                continue
+            break
+        else:
+            # Se agotó el árbol de búsqueda sin encontrar solución
             return None
+
+
+# ============================================================
+# VARIANTE MEJOR-PRIMERO (A*)
+# ============================================================
+# En lugar de bajar en profundidad, siempre se expande el estado
+# abierto con menor f = g + cota_inferior, donde g es la cantidad de
+# movimientos hechos. Como la cota es admisible, la primera solución
+# que sale del heap es de largo mínimo.
+
+def _a_estrella(
+    inicial: PackedState,
+    max_expansions: Optional[int],
+    simetrias: bool = False
+) -> Tuple[Optional[List[tuple]], SearchStats]:
+    """
+    Búsqueda A* desde `inicial` con cota_inferior como heurística.
+    
+    Cada entrada del heap es (f, g, orden, estado, nodo) donde `orden`
+    desempata en orden de inserción y `nodo` = (movimiento, nodo_padre)
+    permite reconstruir el camino sin guardar una lista por estado.
+    Los hijos se generan con generar_movimientos_ordenados, así que a
+    igual f se prueban primero los movimientos que prefiere la DFS.
+    """
+    clave = _clave_canonica if simetrias else _clave
+    stats = SearchStats()
+    mejor_g: Dict[int, int] = {clave(inicial): 0}
+    abiertos = [(cota_inferior(inicial), 0, 0, inicial, None)]
+    orden = 1
+    
+    while abiertos:
+        _, g, _, s, nodo = heappop(abiertos)
+        k = clave(s)
+        if g > mejor_g[k]:
+            continue  # Entrada obsoleta: ya se llegó a s más barato
         
-        # CASO BASE: ¿Hemos alcanzado el objetivo?
-        if is_goal(s):
-            return path  # ¡Solución encontrada!
+        stats.expanded += 1
+        if g > stats.max_depth:
+            stats.max_depth = g
         
-        # Obtener movimientos legales ordenados por heurísticas
-        moves = generar_movimientos_ordenados(s)
+        if _es_objetivo(s):
+            camino = []
+            while nodo is not None:
+                mov, nodo = nodo
+                camino.append(mov)
+            camino.reverse()
+            return camino, stats
         
-        # Intentar cada movimiento posible
-        for (i, j) in moves:
-            # Evitar movimientos reversos inmediatos (optimización)
-            # Si acabamos de hacer j->i, no hacer i->j inmediatamente
-            if last_move and (j, i) == last_move:
-                continue
-            
-            # VALIDACIÓN ADICIONAL: Verificar una vez más antes de aplicar
-            # (en caso de que el estado haya cambiado desde que se generaron los movimientos)
-            if not puede_mover(s[i], s[j]):
-                continue  # Saltar este movimiento si ya no es válido
-            
-            try:
-                # Aplicar el movimiento para obtener nuevo estado
-                nuevo_estado = aplicar_movimiento(s, i, j)
-            except (ValueError, IndexError) as e:
-                # Si hay error al aplicar movimiento, registrarlo y continuar
-                # (no debería pasar, pero es defensivo)
-                continue
-            
-            # Evitar ciclos: si ya visitamos este estado, saltarlo
-            if nuevo_estado in visited:
-                continue
-            
-            # Marcar como visitado y explorar recursivamente
-            visited.add(nuevo_estado)
-            solucion = dfs(nuevo_estado, path + [(i, j)], (i, j))
-            
-            # Si encontramos solución, retornarla inmediatamente
-            if solucion is not None:
-                return solucion
+        if max_expansions and stats.expanded >= max_expansions:
+            break
         
-        # Si ningún movimiento llevó a solución, retornar None (backtrack)
-        return None
+        for mov in _generar_movimientos_ordenados(s):
+            hijo = _aplicar(s, mov[0], mov[1])
+            kh = clave(hijo)
+            if g + 1 >= mejor_g.get(kh, g + 2):
+                continue
+            mejor_g[kh] = g + 1
+            heappush(abiertos, (g + 1 + cota_inferior(hijo), g + 1, orden, hijo, (mov, nodo)))
+            orden += 1
+    
+    return None, stats
+
+
+# ============================================================
+# VARIANTE PARALELA: un subárbol por proceso
+# ============================================================
+# Cada primer movimiento define un subárbol independiente. Se exploran
+# en procesos separados (cada uno con su propio `visited`) y gana el
+# primero que encuentra una solución: en ese momento se avisa al resto
+# mediante un Event compartido para que corten su búsqueda.
 
-    # Iniciar la búsqueda desde el estado inicial
-    solucion = dfs(start, [], None)
+_cancelado = None  # Event compartido, asignado en cada proceso trabajador
+
+
+def _inicializar_trabajador(evento) -> None:
+    """Guarda el Event de cancelación en el proceso trabajador."""
+    global _cancelado
+    _cancelado = evento
+
+
+def _resolver_subarbol(
+    inicial: PackedState,
+    mov: tuple,
+    max_expansions: Optional[int],
+    simetrias: bool = False
+) -> Tuple[Optional[List[tuple]], SearchStats]:
+    """Explora (en un proceso trabajador) el subárbol que empieza con `mov`."""
+    i, j = mov
+    hijo = _aplicar(inicial, i, j)
+    clave = _clave_canonica if simetrias else _clave
+    visited = {clave(inicial), clave(hijo)}
+    stats = SearchStats()
+    solucion = _dfs(hijo, [mov], mov, visited, stats, max_expansions, _cancelado.is_set,
+                    simetrias=simetrias)
+    if solucion is not None:
+        _cancelado.set()
+    return solucion, stats
+
+
+def _solve_paralelo(
+    inicial: PackedState,
+    max_expansions: Optional[int],
+    procesos: int,
+    simetrias: bool = False
+) -> Tuple[Optional[List[tuple]], SearchStats]:
+    """
+    Reparte los primeros movimientos (en orden heurístico) entre `procesos`
+    procesos; se exploran todos los subárboles, a lo sumo `procesos` a la
+    vez. Con max_expansions, cada subárbol recibe
+    max_expansions // len(movimientos) expansiones, de modo que entre
+    todos respetan el límite pedido igual que la búsqueda secuencial (al
+    agotar su cupo cada subárbol solo desanda el camino actual).
+    
+    Las estadísticas suman las de todos los subárboles explorados (más
+    la expansión de la raíz). Como gana el primer proceso que termina,
+    la solución puede variar entre ejecuciones.
+    """
+    stats = SearchStats(expanded=1)
+    if _es_objetivo(inicial):
+        return [], stats
+    
+    movimientos = _generar_movimientos_ordenados(inicial)
+    if not movimientos:
+        return None, stats
+    
+    k = min(procesos, len(movimientos))
+    limite = max(1, max_expansions // len(movimientos)) if max_expansions else None
+    evento = multiprocessing.Event()
+    solucion = None
+    
+    with ProcessPoolExecutor(
+        max_workers=k,
+        initializer=_inicializar_trabajador,
+        initargs=(evento,)
+    ) as ex:
+        futuros = [ex.submit(_resolver_subarbol, inicial, mov, limite, simetrias) for mov in movimientos]
+        for futuro in as_completed(futuros):
+            if futuro.cancelled():
+                continue
+            sol, sub = futuro.result()
+            stats.expanded += sub.expanded
+            stats.max_depth = max(stats.max_depth, sub.max_depth)
+            if sol is not None and solucion is None:
+                solucion = sol
+                evento.set()
+                for pendiente in futuros:
+                    pendiente.cancel()
     
     return solucion, stats
@@ -16,11 +16,18 @@ import json
 import os
 
 # Importar el algoritmo de backtracking desde el módulo core
-from core import (
-    State, Pile, Color, MAX_CAP,
-    solve_backtracking, SearchStats,
-    aplicar_movimiento  # Necesaria para reconstruir
-)
+try:
+    from .core import (
+        State, Pile, Color, MAX_CAP,
+        solve_backtracking, SearchStats,
+        aplicar_movimiento  # Necesaria para reconstruir
+    )
+except ImportError:  # ejecutado como script suelto (python utils.py)
+    from core import (
+        State, Pile, Color, MAX_CAP,
+        solve_backtracking, SearchStats,
+        aplicar_movimiento  # Necesaria para reconstruir
+    )
 
 # ============================================================
 # UTILIDADES DE VISUALIZACIÓN
@@ -1,2 +1,10 @@
 # Módulo Branch and Bound
 
+from .core import State, MAX_CAP, solve_branch_and_bound
+from .utils import (
+    validar_instancia_inicial,
+    generar_estado_aleatorio_unico,
+    dibujar_estado,
+    reconstruir_y_mostrar,
+    estado_a_string,
+)
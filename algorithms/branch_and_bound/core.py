@@ -13,7 +13,8 @@
 
 from collections import Counter, defaultdict
 from dataclasses import dataclass, field
-from typing import Tuple, List, Optional, Set, Dict
+from functools import lru_cache
+from typing import Tuple, List, Optional, Set, Dict, Callable
 from heapq import heappush, heappop
 import math
 
@@ -34,6 +35,31 @@ State = Tuple[Pile, ...]  # Estado completo = tupla de todas las pilas
 # ============================================================
 # Reutilizamos las funciones básicas de backtracking
 
+# Datos de cada pila distinta ya analizada:
+#   pila -> (largo, tope, racha_superior, monocolor, terminada)
+# Las pilas se repiten muchísimo entre estados, así que se recorren una
+# sola vez; después cada consulta es un acierto de la caché en lugar de
+# un recorrido en Python. La caché vive tanto como el proceso (en el
+# servidor, entre todas las búsquedas), por eso está acotada.
+DatosPila = Tuple[int, Optional[Color], int, bool, bool]
+
+
+@lru_cache(maxsize=200_000)
+def datos_pila(p: Pile) -> DatosPila:
+    """Retorna (largo, tope, racha_superior, monocolor, terminada) de la pila."""
+    n = len(p)
+    racha = 0
+    if p:
+        # Recorrer desde el tope y cortar en la primera diferencia
+        c = p[-1]
+        for x in reversed(p):
+            if x != c:
+                break
+            racha += 1
+    monocolor = racha == n
+    return n, p[-1] if p else None, racha, monocolor, monocolor and n == MAX_CAP
+
+
 def top(p: Pile) -> Optional[Color]:
     """Devuelve el color del tope (parte superior) de la pila."""
     return p[-1] if p else None
@@ -46,40 +72,25 @@ def free_slots(p: Pile) -> int:
 
 def run_len_superior(p: Pile) -> int:
     """Cuenta cuántas tuercas del mismo color hay en la parte superior."""
-    if not p:
-        return 0
-    c = p[-1]
-    k = 0
-    for x in reversed(p):
-        if x == c:
-            k += 1
-        else:
-            break
-    return k
+    return datos_pila(p)[2]
 
 
 def pila_es_monocolor(p: Pile) -> bool:
     """Verifica si una pila está resuelta: todas las tuercas son del mismo color."""
-    if len(p) <= 1:
-        return True
-    return all(x == p[0] for x in p)
+    return datos_pila(p)[3]
 
 
 def pila_terminada(p: Pile) -> bool:
     """Verifica si un PERNO está terminado (5 tuercas del mismo color)."""
-    if len(p) == MAX_CAP:
-        return all(x == p[0] for x in p)
-    return False
+    return datos_pila(p)[4]
 
 
 def is_goal(s: State) -> bool:
     """Verifica si el estado actual es el objetivo (resuelto)."""
     for p in s:
-        if len(p) == 0:
-            continue  # Vacío está bien
-        elif len(p) == MAX_CAP and all(x == p[0] for x in p):
-            continue  # 5 tuercas del mismo color está bien
-        else:
+        # Vacío está bien; si no, debe tener 5 tuercas del mismo color.
+        # Corta en la primera pila que no cumple.
+        if p and not datos_pila(p)[4]:
             return False
     return True
 
@@ -114,6 +125,83 @@ def aplicar_movimiento(s: State, i: int, j: int) -> State:
     return tuple(nuevo)
 
 
+def _aplicar(s: State, i: int, j: int) -> State:
+    """
+    Versión sin validar de aplicar_movimiento, para el ciclo de búsqueda:
+    generar_movimientos_validos solo produce movimientos legales, así que
+    volver a verificarlos (y capturar excepciones) es trabajo repetido.
+    """
+    p_src = s[i]
+    nuevo = list(s)
+    nuevo[i] = p_src[:-1]
+    nuevo[j] = s[j] + p_src[-1:]
+    return tuple(nuevo)
+
+
+# ============================================================
+# CLAVES DE ESTADO: enteros en lugar de str(estado)
+# ============================================================
+# Para el diccionario de mejores costos cada estado se identifica con
+# un entero: cada pila se codifica como
+#
+#     bits 0-2 -> cantidad de tuercas (0..5)
+#     bits 3.. -> código de cada tuerca (8 bits), de la base al tope
+#
+# y la pila k ocupa los bits desde BITS_PILA * k. A diferencia de
+# str(estado), armar la clave no pasa por repr() de cada tupla y
+# hashear un entero es mucho más barato que hashear un string largo.
+
+BITS_LARGO = 3
+BITS_CODIGO = 8
+BITS_PILA = BITS_LARGO + BITS_CODIGO * MAX_CAP
+
+# Código de cada pila ya vista. Las pilas son de colores ya codificados,
+# así que el código depende solo de la pila y la caché puede compartirse
+# entre búsquedas (y entre hilos); está acotada para que no crezca
+# indefinidamente en un proceso de larga duración.
+@lru_cache(maxsize=200_000)
+def codigo_pila(p: Pile) -> int:
+    """
+    Codifica una pila como entero (ver esquema arriba). Los colores deben
+    venir codificados por codificar_colores (enteros 1..255), que se usan
+    directamente como código de cada tuerca.
+    """
+    codigo = len(p)
+    for k, c in enumerate(p):
+        codigo |= c << (BITS_LARGO + BITS_CODIGO * k)
+    return codigo
+
+
+def clave_estado(s: State) -> int:
+    """
+    Clave entera única de un estado con colores codificados (ver
+    codificar_colores): los códigos de las pilas concatenados.
+    Dos estados tienen la misma clave si y solo si son iguales.
+    """
+    clave = 0
+    for k, p in enumerate(s):
+        clave |= codigo_pila(p) << (BITS_PILA * k)
+    return clave
+
+
+def codificar_colores(s: State) -> State:
+    """
+    Reemplaza cada color por un entero chico (1, 2, 3... en el orden en
+    que aparecen). El problema no depende de los nombres de los colores
+    y los movimientos son índices de pila, así que el solver trabaja
+    directamente sobre el estado codificado: comparar, contar y hashear
+    enteros chicos es más barato que hacerlo con strings.
+    """
+    codigos: Dict[Color, int] = {}
+    codificado = tuple(
+        tuple(codigos.setdefault(c, len(codigos) + 1) for c in p)
+        for p in s
+    )
+    if len(codigos) > (1 << BITS_CODIGO) - 1:
+        raise ValueError("Demasiados colores distintos para codificar el estado")
+    return codificado
+
+
 # ============================================================
 # ASIGNACIÓN DE COLORES DESTINO (Opción 1 + Resolución Empates)
 # ============================================================
@@ -141,14 +229,42 @@ def calcular_racha_mas_larga(p: Pile, color: Color) -> int:
     return max_racha
 
 
+# Los conteos usan tuple.count, que recorre la pila en C, en lugar de
+# sumar un generador en Python: se llaman varias veces por cada estado
+# generado (ver calcular_lower_bound).
+
 def contar_otros_colores(p: Pile, color: Color) -> int:
     """Cuenta cuántas tuercas de otros colores hay en la pila."""
-    return sum(1 for c in p if c != color)
+    return len(p) - p.count(color)
 
 
 def contar_color_total(p: Pile, color: Color) -> int:
     """Cuenta cuántas tuercas del color dado hay en la pila."""
-    return sum(1 for c in p if c == color)
+    return p.count(color)
+
+
+# Resumen de cada pila distinta, calculado en una sola pasada:
+#   pila -> ({color: cantidad}, color_base, bloques_de_color)
+# Los conteos retornados se comparten entre llamadas: no modificarlos.
+EscaneoPila = Tuple[Dict[Color, int], Optional[Color], int]
+
+
+@lru_cache(maxsize=200_000)
+def escanear_pila(p: Pile) -> EscaneoPila:
+    """
+    Recorre la pila una sola vez y retorna (conteos por color, color de
+    la base, cantidad de bloques de color consecutivos). El resultado
+    se memoriza por pila (caché acotada).
+    """
+    conteos: Dict[Color, int] = {}
+    bloques = 0
+    anterior = None
+    for c in p:
+        conteos[c] = conteos.get(c, 0) + 1
+        if c != anterior:
+            bloques += 1
+            anterior = c
+    return conteos, obtener_color_base(p), bloques
 
 
 def asignar_colores_destino(estado: State) -> Dict[int, Color]:
@@ -209,6 +325,18 @@ def asignar_colores_destino(estado: State) -> Dict[int, Color]:
 # HEURÍSTICA: CÁLCULO DE LOWER BOUND (COTA INFERIOR)
 # ============================================================
 
+# Las asignaciones se usan en forma densa: una tupla con el color
+# destino de cada pila (None si no tiene). Se arma una sola vez por
+# búsqueda y en el ciclo caliente cada consulta es un índice, no una
+# búsqueda en el diccionario.
+DestinosPila = Tuple[Optional[Color], ...]
+
+
+def destinos_por_pila(asignaciones: Dict[int, Color], n: int) -> DestinosPila:
+    """Convierte {perno: color} en la tupla densa de colores destino."""
+    return tuple(asignaciones.get(i) for i in range(n))
+
+
 def calcular_lower_bound(estado: State, asignaciones: Dict[int, Color]) -> int:
     """
     Calcula una cota inferior (lower bound) del número de movimientos
@@ -222,72 +350,97 @@ def calcular_lower_bound(estado: State, asignaciones: Dict[int, Color]) -> int:
     
     Retorna un entero >= 0 representando el mínimo estimado de movimientos.
     """
+    return _lower_bound(estado, destinos_por_pila(asignaciones, len(estado)))
+
+
+def _lower_bound(estado: State, destinos: DestinosPila) -> int:
+    """Cuerpo de calcular_lower_bound sobre las asignaciones densas."""
     if is_goal(estado):
         return 0
     
+    # Una sola pasada por pila (memorizada, ver escanear_pila) en lugar
+    # de contar cada color destino en cada pila por separado
+    escaneos = [escanear_pila(p) for p in estado]
+    
+    # Total de tuercas de cada color en todo el estado
+    totales: Dict[Color, int] = {}
+    for conteos, _, _ in escaneos:
+        for color, cantidad in conteos.items():
+            totales[color] = totales.get(color, 0) + cantidad
+    
     movimientos_estimados = 0
     
-    # Para cada color asignado a un perno destino
-    for perno_destino, color_destino in asignaciones.items():
-        pila_destino = estado[perno_destino]
+    for (conteos, base, bloques), color_destino, pila in zip(escaneos, destinos, estado):
+        if color_destino is None:
+            # Pila sin color destino asignado (vacía o con color no
+            # asignado): puede servir como buffer, pero si está mezclada
+            # necesita al menos bloques-1 movimientos para limpiarla
+            if bloques > 1:
+                movimientos_estimados += bloques - 1
+            continue
         
         # Contar cuántas tuercas del color destino hay en esta pila
-        tuercas_en_destino = contar_color_total(pila_destino, color_destino)
+        tuercas_en_destino = conteos.get(color_destino, 0)
         
         # Si faltan tuercas, necesitamos moverlas desde otros pernos
-        tuercas_faltantes = MAX_CAP - tuercas_en_destino
+        # Optimista: al menos 1 movimiento por tuerca faltante (si no están atrapadas)
+        movimientos_estimados += MAX_CAP - tuercas_en_destino
         
-        if tuercas_faltantes > 0:
-            # Estimar movimientos para traer las tuercas faltantes
-            # Optimista: al menos 1 movimiento por tuerca faltante (si no están atrapadas)
-            movimientos_estimados += tuercas_faltantes
+        # Tuercas de otros colores en el perno destino: deben moverse
+        # fuera (mínimo 1 movimiento por tuerca diferente)
+        movimientos_estimados += len(pila) - tuercas_en_destino
         
-        # Contar tuercas de otros colores que están en el perno destino
-        # Estas deben moverse fuera (mínimo 1 movimiento por tuerca diferente)
-        tuercas_otras = contar_otros_colores(pila_destino, color_destino)
-        movimientos_estimados += tuercas_otras
+        # Detectar tuercas atrapadas: si la base no es del color destino,
+        # todas las tuercas del color destino están atrapadas
+        if base is not None and base != color_destino:
+            movimientos_estimados += tuercas_en_destino
         
-        # Detectar tuercas atrapadas: si hay tuercas del color destino
-        # pero están bajo otro color, necesitamos más movimientos
-        if len(pila_destino) > 0:
-            # Verificar si la base es del color destino
-            if obtener_color_base(pila_destino) != color_destino:
-                # Si no, todas las tuercas del color destino están atrapadas
-                movimientos_estimados += tuercas_en_destino
-    
-    # Buscar tuercas del color destino en otros pernos
-    for color_destino in asignaciones.values():
-        tuercas_en_otros_pernos = 0
-        
-        for i, pila in enumerate(estado):
-            if i not in asignaciones or asignaciones[i] != color_destino:
-                # Este perno no es el destino de este color
-                tuercas_en_otros_pernos += contar_color_total(pila, color_destino)
-        
-        # Estimar movimientos para traer estas tuercas
-        # Optimista: al menos 1 movimiento por tuerca
-        if tuercas_en_otros_pernos > 0:
-            movimientos_estimados += tuercas_en_otros_pernos
-    
-    # Para pilas sin color destino asignado (vacías o con color no asignado)
-    # Considerar que pueden servir como buffer, pero penalizar si tienen mezclas
-    for i, pila in enumerate(estado):
-        if i not in asignaciones:
-            if len(pila) > 0:
-                # Esta pila tiene tuercas pero no tiene destino asignado
-                # Puede ser un buffer, pero si está mezclada necesita movimientos
-                if not pila_es_monocolor(pila):
-                    # Pila mezclada: estimar movimientos para limpiarla
-                    # Contar bloques de colores diferentes
-                    bloques = 1
-                    for j in range(1, len(pila)):
-                        if pila[j] != pila[j-1]:
-                            bloques += 1
-                    movimientos_estimados += bloques - 1  # Al menos bloques-1 movimientos
+        # Tuercas del color destino en otros pernos: al menos 1
+        # movimiento por tuerca para traerlas
+        movimientos_estimados += totales.get(color_destino, 0) - tuercas_en_destino
     
     return movimientos_estimados
 
 
+def _especializar_lower_bound(start: State, destinos: DestinosPila) -> Callable[[Pile, int], int]:
+    """
+    Especializa _lower_bound para una búsqueda: retorna aporte_pila(pila, k),
+    el aporte a la cota de `pila` ubicada en la posición k.
+    
+    Los movimientos no cambian cuántas tuercas hay de cada color, así
+    que los totales por color se calculan una sola vez desde `start`.
+    Con eso el aporte de cada pila a la cota depende solo de su
+    contenido y de su color destino, y se memoriza por (pila, destino).
+    Para un estado que no es objetivo, _lower_bound es exactamente la
+    suma de los aportes de sus pilas (en un objetivo la cota es 0).
+    """
+    totales: Dict[Color, int] = {}
+    for p in start:
+        for c in p:
+            totales[c] = totales.get(c, 0) + 1
+    
+    aportes: Dict[Tuple[Pile, Optional[Color]], int] = {}
+    
+    def aporte(pila: Pile, color_destino: Optional[Color]) -> int:
+        conteos, base, bloques = escanear_pila(pila)
+        if color_destino is None:
+            return bloques - 1 if bloques > 1 else 0
+        en_destino = conteos.get(color_destino, 0)
+        valor = (MAX_CAP - en_destino) + (len(pila) - en_destino)
+        if base is not None and base != color_destino:
+            valor += en_destino
+        return valor + totales.get(color_destino, 0) - en_destino
+    
+    def aporte_pila(pila: Pile, k: int) -> int:
+        par = (pila, destinos[k])
+        v = aportes.get(par)
+        if v is None:
+            v = aportes[par] = aporte(*par)
+        return v
+    
+    return aporte_pila
+
+
 def es_estado_imposible(estado: State, asignaciones: Dict[int, Color]) -> bool:
     """
     Detecta si un estado es imposible de resolver (podar agresivamente).
@@ -300,7 +453,21 @@ def es_estado_imposible(estado: State, asignaciones: Dict[int, Color]) -> bool:
     
     Retorna True si el estado es imposible de resolver.
     """
-    # Verificar que ningún color tenga más tuercas de las permitidas
+    return _es_imposible(estado, destinos_por_pila(asignaciones, len(estado)))
+
+
+def _es_imposible(estado: State, destinos: DestinosPila) -> bool:
+    """Cuerpo de es_estado_imposible sobre las asignaciones densas."""
+    return hay_color_excedido(estado) or _hay_deadlock(estado, destinos)
+
+
+def hay_color_excedido(estado: State) -> bool:
+    """
+    Verifica si algún color tiene más de MAX_CAP tuercas en total.
+    
+    Los movimientos no cambian la cantidad de tuercas de cada color, así
+    que durante una búsqueda alcanza con verificarlo en el estado inicial.
+    """
     contador_colores = Counter()
     for pila in estado:
         for color in pila:
@@ -309,9 +476,19 @@ def es_estado_imposible(estado: State, asignaciones: Dict[int, Color]) -> bool:
     for color, cantidad in contador_colores.items():
         if cantidad > MAX_CAP:
             return True  # Imposible: más tuercas de un color que capacidad
-    
+    return False
+
+
+def _hay_deadlock(estado: State, destinos: DestinosPila) -> bool:
+    """
+    Verifica deadlocks simples: algún perno destino lleno, con base de
+    otro color y sin espacio en el resto para sacar las tuercas que
+    bloquean.
+    """
     # Verificar deadlocks simples: perno destino completamente bloqueado
-    for perno_destino, color_destino in asignaciones.items():
+    for perno_destino, color_destino in enumerate(destinos):
+        if color_destino is None:
+            continue
         pila = estado[perno_destino]
         
         # Si la base no es del color destino y la pila está llena
@@ -335,7 +512,12 @@ def es_estado_imposible(estado: State, asignaciones: Dict[int, Color]) -> bool:
 # ALGORITMO PRINCIPAL: BRANCH AND BOUND
 # ============================================================
 
-@dataclass
+# Tamaño máximo de cada caché de heurísticas por búsqueda (ver
+# solve_branch_and_bound). Al llenarse se vacía y vuelve a empezar.
+MAX_CACHE_HEURISTICA = 1 << 22
+
+
+@dataclass(slots=True)
 class SearchStats:
     """Estadísticas de la búsqueda."""
     expanded: int = 0
@@ -344,47 +526,86 @@ class SearchStats:
     mejor_cota_encontrada: int = field(default_factory=lambda: math.inf)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Node:
     """Nodo del árbol de búsqueda para Branch and Bound."""
     estado: State
     g: int  # Costo acumulado (número de movimientos)
     h: int  # Heurística (lower bound)
-    path: List[Tuple[int, int]]  # Secuencia de movimientos hasta aquí
-    f: int = 0  # f = g + h (se calcula automáticamente)
-    
-    def __post_init__(self):
-        self.f = self.g + self.h
+    padre: Optional["Node"]  # Nodo desde el que se llegó (None en la raíz)
+    movimiento: Optional[Tuple[int, int]]  # Movimiento (i, j) desde el padre
+    clave: int = 0  # clave_estado(estado), actualizada en cada movimiento
+    
+    def camino(self) -> List[Tuple[int, int]]:
+        """
+        Reconstruye la secuencia de movimientos desde la raíz siguiendo
+        los punteros al padre. Solo se llama al encontrar una solución,
+        así que expandir un nodo no copia el camino.
+        """
+        movimientos = []
+        nodo = self
+        while nodo.padre is not None:
+            movimientos.append(nodo.movimiento)
+            nodo = nodo.padre
+        movimientos.reverse()
+        return movimientos
+    
+    @property
+    def f(self) -> int:
+        """f = g + h"""
+        return self.g + self.h
     
     def __lt__(self, other):
-        """Comparación para heapq (menor f = mayor prioridad)."""
-        if self.f != other.f:
-            return self.f < other.f
-        # Desempate: preferir menor profundidad (g)
-        return self.g < other.g
+        """
+        Desempate en el heap: a igual (f, g) ningún nodo es menor que
+        otro, así que el orden entre empatados lo decide la estructura
+        del heap (igual que cuando Node se comparaba por (f, g)).
+        """
+        return False
 
 
-def generar_movimientos_validos(s: State) -> List[Tuple[int, int]]:
+def generar_movimientos_validos(
+    s: State,
+    destinos: Optional[DestinosPila] = None
+) -> List[Tuple[int, int]]:
     """
     Genera todos los movimientos válidos desde el estado s.
     
     Similar a backtracking pero sin ordenamiento heurístico especial
     (el ordenamiento lo hace la cola de prioridad).
+    
+    Si dos destinos posibles son pilas idénticas (por ejemplo dos pilas
+    vacías) con el mismo color destino asignado (ver destinos_por_pila),
+    mover a una u otra da estados simétricos: solo se genera el
+    movimiento hacia la primera de ellas.
     """
     N = len(s)
     movimientos = []
+    if destinos is None:
+        destinos = (None,) * N
+    
+    # Datos de cada pila calculados UNA vez por estado (no N² veces)
+    datos = [datos_pila(p) for p in s]
+    terminada = [d[4] for d in datos]
+    largos = [d[0] for d in datos]
+    tops = [d[1] for d in datos]
     
     for i in range(N):
-        if pila_terminada(s[i]):
-            continue  # No mover desde pilas terminadas
+        if terminada[i] or not largos[i]:
+            continue  # No mover desde pilas terminadas (ni vacías)
         
+        c = tops[i]
+        vistos = set()  # (pila, color destino) de los destinos ya usados
         for j in range(N):
-            if i == j:
-                continue
-            if pila_terminada(s[j]):
+            if i == j or terminada[j]:
                 continue  # No mover hacia pilas terminadas
             
-            if puede_mover(s[i], s[j]):
+            # Reglas de puede_mover: destino vacío, o con lugar y mismo tope
+            if not largos[j] or (largos[j] < MAX_CAP and tops[j] == c):
+                firma = (s[j], destinos[j])
+                if firma in vistos:
+                    continue  # Destino simétrico a uno ya generado
+                vistos.add(firma)
                 movimientos.append((i, j))
     
     return movimientos
@@ -392,7 +613,9 @@ def generar_movimientos_validos(s: State) -> List[Tuple[int, int]]:
 
 def solve_branch_and_bound(
     start: State,
-    max_expansions: Optional[int] = None
+    max_expansions: Optional[int] = None,
+    weight: float = 1.0,
+    beam_width: Optional[int] = None
 ) -> Tuple[Optional[List[Tuple[int, int]]], SearchStats]:
     """
     Resuelve el problema usando Branch and Bound con Best-First Search.
@@ -407,27 +630,49 @@ def solve_branch_and_bound(
     Parámetros:
         start: Estado inicial
         max_expansions: Límite opcional de estados a expandir
+        weight: Peso w de la heurística para ordenar la cola (A* ponderado):
+                los nodos salen por g + int(w * h). Con w = 1 (por defecto)
+                es la búsqueda de siempre; con w > 1 se adentra antes en
+                los estados con h chica y suele expandir muchos menos
+                nodos, a cambio de soluciones potencialmente más largas
+                (si h fuera admisible, a lo sumo w veces la óptima). Las
+                podas siguen usando f = g + h sin ponderar.
+        beam_width: Si se indica, de cada nodo expandido solo se encolan
+                    los `beam_width` mejores hijos (menor f; los demás
+                    cuentan como podados). Acota el crecimiento de la cola
+                    en instancias grandes, pero puede perder la solución
+                    óptima o incluso toda solución. None (por defecto)
+                    encola todos los hijos.
     
     Retorna:
         (solucion, stats) donde:
         - solucion: Lista de movimientos (i, j) que llevan a la solución, o None
         - stats: Estadísticas de la búsqueda
     """
+    # Buscar sobre colores codificados como enteros (ver codificar_colores);
+    # la solución son índices de pila y vale igual para el estado original
+    start = codificar_colores(start)
+    
     # Calcular asignaciones de colores destino una sola vez
     asignaciones = asignar_colores_destino(start)
+    destinos = destinos_por_pila(asignaciones, len(start))
     
     stats = SearchStats()
     mejor_solucion: Optional[List[Tuple[int, int]]] = None
     mejor_costo = math.inf
     
-    # Cola de prioridad: (f, g, estado, path)
-    heap = []
+    # Cola de prioridad de tuplas (f, g, nodo), con f ponderada según
+    # `weight`: heapq compara enteros en C y solo llega a Node.__lt__
+    # cuando (f, g) empata.
+    heap: List[Tuple[int, int, Node]] = []
     
     # Calcular heurística inicial
-    h_inicial = calcular_lower_bound(start, asignaciones)
+    h_inicial = _lower_bound(start, destinos)
     
-    # Verificar si el estado inicial es imposible
-    if es_estado_imposible(start, asignaciones):
+    # Verificar si el estado inicial es imposible. El conteo de colores
+    # no cambia con los movimientos: se verifica solo acá, y durante la
+    # búsqueda solo se buscan deadlocks (ver imposible)
+    if _es_imposible(start, destinos):
         return None, stats
     
     # Nodo inicial
@@ -435,38 +680,51 @@ def solve_branch_and_bound(
         estado=start,
         g=0,
         h=h_inicial,
-        path=[]
+        padre=None,
+        movimiento=None,
+        clave=clave_estado(start)
     )
-    heappush(heap, nodo_inicial)
+    heappush(heap, (int(weight * h_inicial), 0, nodo_inicial))
     
     # Diccionario de mejor costo conocido para cada estado
-    # {estado_string: mejor_g_conocido}
-    mejor_g_por_estado: Dict[str, int] = {}
-    # Función auxiliar para convertir estado a string único
-    def estado_a_string(s: State) -> str:
-        """Convierte un estado a string para usar como clave."""
-        return str(s)
+    # {clave_estado: mejor_g_conocido}
+    mejor_g_por_estado: Dict[int, int] = {}
     
     # Verificar estado inicial
-    estado_str_inicial = estado_a_string(start)
-    mejor_g_por_estado[estado_str_inicial] = 0
+    mejor_g_por_estado[nodo_inicial.clave] = 0
+    
+    # Cachés de la cota y de la detección de imposibles por clave de
+    # estado: el mismo estado llega muchas veces por caminos distintos
+    # antes de que la PODA 5 lo descarte, y ambas dependen solo del
+    # estado (las asignaciones son fijas durante la búsqueda)
+    cache_h: Dict[int, int] = {}
+    cache_imposible: Dict[int, bool] = {}
+    aporte_pila = _especializar_lower_bound(start, destinos)
+    
+    def imposible(estado: State, clave: int) -> bool:
+        r = cache_imposible.get(clave)
+        if r is None:
+            if len(cache_imposible) >= MAX_CACHE_HEURISTICA:
+                cache_imposible.clear()
+            r = cache_imposible[clave] = _hay_deadlock(estado, destinos)
+        return r
     
     while heap:
         # Obtener el nodo con menor f(n)
-        nodo_actual = heappop(heap)
+        _, _, nodo_actual = heappop(heap)
         
         # Verificar límite de expansiones
         if max_expansions and stats.expanded >= max_expansions:
             break
         
         stats.expanded += 1
-        stats.max_depth = max(stats.max_depth, len(nodo_actual.path))
+        stats.max_depth = max(stats.max_depth, nodo_actual.g)
         
         # CASO BASE: ¿Hemos alcanzado el objetivo?
         if is_goal(nodo_actual.estado):
             # Si encontramos una solución mejor que la actual, actualizarla
             if nodo_actual.g < mejor_costo:
-                mejor_solucion = nodo_actual.path
+                mejor_solucion = nodo_actual.camino()
                 mejor_costo = nodo_actual.g
                 stats.mejor_cota_encontrada = mejor_costo
             # No expandir este nodo (ya es solución)
@@ -479,21 +737,42 @@ def solve_branch_and_bound(
                 continue  # Podar: no puede mejorar la solución actual
         
         # PODA 2: Si el estado es imposible
-        if es_estado_imposible(nodo_actual.estado, asignaciones):
+        if imposible(nodo_actual.estado, nodo_actual.clave):
             stats.pruned += 1
             continue
         
         # Generar movimientos válidos
-        movimientos = generar_movimientos_validos(nodo_actual.estado)
+        movimientos = generar_movimientos_validos(nodo_actual.estado, destinos)
+        hijos = []  # (prioridad, g, nodo) de los hijos que pasan las podas
+        
+        # Los hijos se evalúan en lote contra el padre: cada uno difiere
+        # solo en las pilas i y j, así que su cota es la suma de aportes
+        # del padre (calculada una vez por expansión) corregida en esas
+        # dos pilas, en lugar de recorrer el estado completo por hijo
+        aportes = [aporte_pila(p, k) for k, p in enumerate(nodo_actual.estado)]
+        suma_aportes = sum(aportes)
         
         for (i, j) in movimientos:
-            try:
-                nuevo_estado = aplicar_movimiento(nodo_actual.estado, i, j)
-            except (ValueError, IndexError):
-                continue  # Movimiento inválido, saltar
+            nuevo_estado = _aplicar(nodo_actual.estado, i, j)
+            
+            # Un movimiento solo cambia las pilas i y j: la clave se
+            # actualiza con dos XOR en lugar de recalcularse completa
+            clave = (nodo_actual.clave
+                     ^ ((codigo_pila(nodo_actual.estado[i]) ^ codigo_pila(nuevo_estado[i])) << (BITS_PILA * i))
+                     ^ ((codigo_pila(nodo_actual.estado[j]) ^ codigo_pila(nuevo_estado[j])) << (BITS_PILA * j)))
             
             nuevo_g = nodo_actual.g + 1
-            nuevo_h = calcular_lower_bound(nuevo_estado, asignaciones)
+            nuevo_h = cache_h.get(clave)
+            if nuevo_h is None:
+                if len(cache_h) >= MAX_CACHE_HEURISTICA:
+                    cache_h.clear()
+                if is_goal(nuevo_estado):
+                    nuevo_h = 0
+                else:
+                    nuevo_h = (suma_aportes - aportes[i] - aportes[j]
+                               + aporte_pila(nuevo_estado[i], i)
+                               + aporte_pila(nuevo_estado[j], j))
+                cache_h[clave] = nuevo_h
             nuevo_f = nuevo_g + nuevo_h
             
             # PODA 3: Si f(n) >= mejor_costo, podar
@@ -502,30 +781,40 @@ def solve_branch_and_bound(
                 continue
             
             # PODA 4: Si el nuevo estado es imposible
-            if es_estado_imposible(nuevo_estado, asignaciones):
+            if imposible(nuevo_estado, clave):
                 stats.pruned += 1
                 continue
             
-            estado_str = estado_a_string(nuevo_estado)
-            
             # PODA 5: Si ya visitamos este estado con mejor o igual costo
-            if estado_str in mejor_g_por_estado:
-                if mejor_g_por_estado[estado_str] <= nuevo_g:
-                    continue  # Ya exploramos este estado con mejor o igual costo
-                # Si encontramos mejor camino, actualizar y explorar de nuevo
-                mejor_g_por_estado[estado_str] = nuevo_g
-            else:
-                mejor_g_por_estado[estado_str] = nuevo_g
+            # (una sola búsqueda en la tabla: get en lugar de `in` + [])
+            g_previo = mejor_g_por_estado.get(clave)
+            if g_previo is not None and g_previo <= nuevo_g:
+                continue  # Ya exploramos este estado con mejor o igual costo
             
-            # Crear nuevo nodo y agregarlo a la cola
+            # Crear nuevo nodo (candidato a la cola)
             nuevo_nodo = Node(
                 estado=nuevo_estado,
                 g=nuevo_g,
                 h=nuevo_h,
-                path=nodo_actual.path + [(i, j)]
+                padre=nodo_actual,
+                movimiento=(i, j),
+                clave=clave
             )
             
-            heappush(heap, nuevo_nodo)
+            prioridad = nuevo_f if weight == 1 else nuevo_g + int(weight * nuevo_h)
+            hijos.append((prioridad, nuevo_g, nuevo_nodo))
+        
+        # Búsqueda en haz: quedarse solo con los mejores hijos (sort
+        # estable, así que a igual prioridad se respeta el orden de generación)
+        if beam_width is not None and len(hijos) > beam_width:
+            hijos.sort(key=lambda hijo: (hijo[0], hijo[1]))
+            stats.pruned += len(hijos) - beam_width
+            del hijos[beam_width:]
+        
+        for prioridad, nuevo_g, nuevo_nodo in hijos:
+            # Estado nuevo o mejor camino: actualizar y explorar (de nuevo)
+            mejor_g_por_estado[nuevo_nodo.clave] = nuevo_g
+            heappush(heap, (prioridad, nuevo_g, nuevo_nodo))
     
     return mejor_solucion, stats
 
@@ -13,11 +13,18 @@ import json
 import os
 
 # Importar el algoritmo de Branch and Bound desde el módulo core
-from core import (
-    State, Pile, Color, MAX_CAP,
-    solve_branch_and_bound, SearchStats,
-    aplicar_movimiento  # Necesaria para reconstruir
-)
+try:
+    from .core import (
+        State, Pile, Color, MAX_CAP,
+        solve_branch_and_bound, SearchStats,
+        aplicar_movimiento  # Necesaria para reconstruir
+    )
+except ImportError:  # ejecutado como script suelto (python utils.py)
+    from core import (
+        State, Pile, Color, MAX_CAP,
+        solve_branch_and_bound, SearchStats,
+        aplicar_movimiento  # Necesaria para reconstruir
+    )
 
 # ============================================================
 # UTILIDADES DE VISUALIZACIÓN
@@ -7,7 +7,11 @@ ROOT_DIR = os.path.dirname(BASE_DIR)
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-from server import app as flask_app  # noqa: E402
+from server import app as flask_app, precalentar  # noqa: E402
 
 app = flask_app
 
+# Arranque en frío: cargar los algoritmos y precalentar los solvers al
+# importar el módulo, no durante la primera petición
+precalentar()
+
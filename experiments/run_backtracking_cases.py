@@ -11,27 +11,18 @@ Uso:
 
 from __future__ import annotations
 
-import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Iterable, Tuple
 
-import importlib
+from algorithms.backtracking import core as bt_core
+from algorithms.backtracking import utils as bt_utils
 
-BASE_DIR = Path(__file__).resolve().parents[1]
-BACKTRACKING_DIR = BASE_DIR / "algorithms" / "backtracking"
-
-if str(BACKTRACKING_DIR) not in sys.path:
-    sys.path.insert(0, str(BACKTRACKING_DIR))
-
-bt_core = importlib.import_module("core")
-bt_utils = importlib.import_module("utils")
-
-State = bt_core.State  # type: ignore[attr-defined]
-solve_backtracking = bt_core.solve_backtracking  # type: ignore[attr-defined]
-dibujar_estado = bt_utils.dibujar_estado  # type: ignore[attr-defined]
-validar_instancia_inicial = bt_utils.validar_instancia_inicial  # type: ignore[attr-defined]
+State = bt_core.State
+solve_backtracking = bt_core.solve_backtracking
+dibujar_estado = bt_utils.dibujar_estado
+validar_instancia_inicial = bt_utils.validar_instancia_inicial
 
 
 Color = str
@@ -180,7 +171,11 @@ def imprimir_resultados(resultados: Iterable[dict]) -> None:
 
 
 def main() -> None:
-    resultados = [ejecutar_caso(caso) for caso in CASOS]
+    # Los casos son independientes: se ejecutan en paralelo, uno por
+    # proceso (map conserva el orden de CASOS). Cada tiempo sigue siendo
+    # el de su propio caso, medido dentro del proceso que lo resolvió.
+    with ProcessPoolExecutor() as ex:
+        resultados = list(ex.map(ejecutar_caso, CASOS))
     imprimir_resultados(resultados)
 
 
@@ -13,44 +13,28 @@ El script produce:
 from __future__ import annotations
 
 import csv
-import importlib
 import math
 import random
 import statistics
-import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
-BASE_DIR = Path(__file__).resolve().parents[1]
-BT_DIR = BASE_DIR / "algorithms" / "backtracking"
-BNB_DIR = BASE_DIR / "algorithms" / "branch_and_bound"
-
-if str(BT_DIR) not in sys.path:
-    sys.path.insert(0, str(BT_DIR))
-
-bt_core = importlib.import_module("core")
-bt_utils = importlib.import_module("utils")
+from algorithms.backtracking import core as bt_core
+from algorithms.branch_and_bound import core as bnb_core
 
-# Limpiar nombres genéricos para permitir cargar branch_and_bound sin colisiones
-sys.modules.pop("core", None)
-sys.modules.pop("utils", None)
-
-if str(BNB_DIR) not in sys.path:
-    sys.path.insert(0, str(BNB_DIR))
-
-bnb_core = importlib.import_module("core")
-bnb_utils = importlib.import_module("utils")
+BASE_DIR = Path(__file__).resolve().parents[1]
 
-State = bt_core.State  # type: ignore[attr-defined]
+State = bt_core.State
 Color = str
 
-solve_backtracking = bt_core.solve_backtracking  # type: ignore[attr-defined]
-solve_branch_and_bound = bnb_core.solve_branch_and_bound  # type: ignore[attr-defined]
-is_goal = bt_core.is_goal  # type: ignore[attr-defined]
-MAX_CAP = bt_core.MAX_CAP  # type: ignore[attr-defined]
-estado_a_string = bt_utils.estado_a_string  # type: ignore[attr-defined]
+solve_backtracking = bt_core.solve_backtracking
+solve_branch_and_bound = bnb_core.solve_branch_and_bound
+is_goal = bt_core.is_goal
+MAX_CAP = bt_core.MAX_CAP
 
 
 @dataclass
@@ -64,38 +48,90 @@ class CasoGenerado:
 
 
 COLORES_STANDARD = ("R", "G", "B", "Y", "O", "V", "P", "C", "M", "S", "L", "T", "D", "A", "I")
+# Prefijos de la paleta por cantidad de colores, armados una sola vez.
+COLORES_POR_N: Dict[int, Tuple[Color, ...]] = {
+    n: COLORES_STANDARD[:n] for n in range(1, len(COLORES_STANDARD) + 1)
+}
+
+# Generador compartido por los tres generadores de casos: cada caso lo
+# resiembra con su semilla (misma secuencia que random.Random(seed)) en lugar
+# de crear una instancia nueva. Solo lo usa el proceso principal.
+_RNG = random.Random()
 
 
 def generar_estado_barajado(colores: Tuple[Color, ...], rng: random.Random, movimientos: int) -> State:
     """Parte de una solución resuelta y aplica movimientos aleatorios válidos."""
-    pilas: List[List[Color]] = [[color for _ in range(MAX_CAP)] for color in colores]
-    pilas.append([])  # buffer vacío
-
-    for _ in range(movimientos):
-        movimientos_posibles = []
-        for i, pila_src in enumerate(pilas):
-            if not pila_src:
-                continue
-            for j, pila_dst in enumerate(pilas):
-                if i == j or len(pila_dst) >= MAX_CAP:
-                    continue
-                if not pila_dst or pila_src[-1] == pila_dst[-1]:
-                    movimientos_posibles.append((i, j))
-        if not movimientos_posibles:
-            break
-        i, j = rng.choice(movimientos_posibles)
-        tuerca = pilas[i].pop()
-        pilas[j].append(tuerca)
-
-    estado = tuple(tuple(p) for p in pilas)
-    if is_goal(estado):  # type: ignore[attr-defined]
-        # Si accidentalmente queda resuelto, force otro barajado con más pasos
-        return generar_estado_barajado(colores, rng, movimientos + 1)
-    return estado
+    # Las pilas se quedan como listas de colores: con a lo sumo 16 pilas de
+    # MAX_CAP tuercas, pop/append cuestan menos que las máscaras y shifts
+    # de la forma empaquetada del solver (codificar_estado), que se midió
+    # algo más lenta acá. Las listas se reutilizan entre reintentos.
+    pilas: List[List[Color]] = [[] for _ in range(len(colores) + 1)]  # + buffer vacío
+    n = len(pilas)
+    indices = range(n)
+    # Los movimientos legales se representan como una máscara de bits: el
+    # bit i*n + j indica que se puede mover de la pila i a la j. Para cada
+    # pila se mantiene su bit propio y el corrimiento de su fila.
+    propios = [1 << k for k in indices]
+    filas = [k * n for k in indices]
+    sortear = rng.randrange
+
+    while True:
+        for pila, color in zip(pilas, colores):
+            pila[:] = [color] * MAX_CAP
+        pilas[-1].clear()
+        # Vista "por columnas" del estado: tope y largo de cada pila, más
+        # máscaras de destinos posibles (pilas vacías y, por color, pilas no
+        # llenas con ese tope). Los destinos de la pila i salen de un OR.
+        topes: List[Optional[Color]] = [*colores, None]
+        largos: List[int] = [MAX_CAP] * len(colores) + [0]
+        vacias = propios[-1]
+        abiertas: Dict[Color, int] = dict.fromkeys(colores, 0)
+
+        for _ in range(movimientos):
+            legales = 0
+            for i in indices:
+                if largos[i]:
+                    destinos = (vacias | abiertas[topes[i]]) & ~propios[i]
+                    legales |= destinos << filas[i]
+            if not legales:
+                break
+            # k-ésimo bit encendido: mismo orden que recorrer los pares (i, j)
+            for _ in range(sortear(legales.bit_count())):
+                legales &= legales - 1  # apagar el bit más bajo
+            i, j = divmod((legales & -legales).bit_length() - 1, n)
+
+            origen, destino = pilas[i], pilas[j]
+            tuerca = origen.pop()
+            bit_i, bit_j = propios[i], propios[j]
+            # Sacar ambas pilas de las máscaras con su tope anterior...
+            abiertas[tuerca] &= ~bit_i
+            if destino:
+                abiertas[tuerca] &= ~bit_j
+            else:
+                vacias &= ~bit_j
+            destino.append(tuerca)
+            # ...y volver a agregarlas con el tope nuevo
+            if origen:
+                topes[i] = origen[-1]
+                abiertas[origen[-1]] |= bit_i
+            else:
+                topes[i] = None
+                vacias |= bit_i
+            if len(destino) < MAX_CAP:
+                abiertas[tuerca] |= bit_j
+            largos[i] -= 1
+            largos[j] += 1
+            topes[j] = tuerca
+
+        estado = tuple(tuple(p) for p in pilas)
+        if not is_goal(estado):
+            return estado
+        # Si accidentalmente queda resuelto, se baraja de nuevo con más pasos
+        movimientos += 1
 
 
 def generar_casos_solubles(
-    vistos: set[str],
+    vistos: set[State],
     colores_por_caso: Iterable[int] = (3, 4, 5),
     casos_por_color: int = 10,
     barra_min: int = 12,
@@ -104,16 +140,16 @@ def generar_casos_solubles(
 ) -> List[CasoGenerado]:
     casos: List[CasoGenerado] = []
     for color_idx, num_colores in enumerate(colores_por_caso):
-        colores = COLORES_STANDARD[:num_colores]
+        colores = COLORES_POR_N[num_colores]
         for idx in range(casos_por_color):
             seed = seed_base + color_idx * 1000 + idx
-            rng = random.Random(seed)
+            _RNG.seed(seed)
+            rng = _RNG
             movimientos = rng.randint(barra_min, barra_max)
             while True:
                 estado = generar_estado_barajado(colores, rng, movimientos)
-                clave = estado_a_string(estado)
-                if clave not in vistos:
-                    vistos.add(clave)
+                if estado not in vistos:
+                    vistos.add(estado)
                     break
                 movimientos += 1
             case_id = f"S{num_colores}c_{idx:02d}"
@@ -121,7 +157,7 @@ def generar_casos_solubles(
                 CasoGenerado(
                     case_id=case_id,
                     categoria="soluble",
-                    colores=tuple(colores),
+                    colores=colores,
                     estado=estado,
                     shuffle_len=movimientos,
                     resoluble=True,
@@ -131,22 +167,29 @@ def generar_casos_solubles(
 
 
 def mutar_a_insoluble(estado: State) -> State:
-    pilas = [list(p) for p in estado]
-    if not pilas or len(pilas) < 2:
+    """
+    Cambia a `objetivo` (el color de la base de P0) la primera tuerca de
+    otro color, fuera del buffer. Solo se reconstruyen la pila tocada y la
+    tupla externa; el resto de las pilas se comparte con `estado`.
+    """
+    if len(estado) < 2:
         return estado
-    objetivo = pilas[0][0]
-    for pila in pilas[:-1]:  # evitar buffer
-        for idx, color in enumerate(pila):
-            if color != objetivo:
-                pila[idx] = objetivo
-                return tuple(tuple(p) for p in pilas)
-    # Si todas las pilas son iguales (caso extremo), forzar cambio manual
-    pilas[1][0] = objetivo
-    return tuple(tuple(p) for p in pilas)
+    objetivo = estado[0][0]
+    p, c = next(
+        (
+            (p, c)
+            for p, pila in enumerate(estado[:-1])  # evitar buffer
+            for c, color in enumerate(pila)
+            if color != objetivo
+        ),
+        (1, 0),  # Si todas las pilas son iguales (caso extremo), forzar cambio manual
+    )
+    pila = estado[p]
+    return estado[:p] + (pila[:c] + (objetivo,) + pila[c + 1:],) + estado[p + 1:]
 
 
 def generar_casos_insolubles(
-    vistos: set[str],
+    vistos: set[State],
     total: int = 10,
     colores_opciones: Tuple[int, ...] = (3, 4, 5),
     barra_min: int = 10,
@@ -156,16 +199,16 @@ def generar_casos_insolubles(
     casos: List[CasoGenerado] = []
     for idx in range(total):
         num_colores = colores_opciones[idx % len(colores_opciones)]
-        colores = COLORES_STANDARD[:num_colores]
+        colores = COLORES_POR_N[num_colores]
         seed = seed_base + idx
-        rng = random.Random(seed)
+        _RNG.seed(seed)
+        rng = _RNG
         movimientos = rng.randint(barra_min, barra_max)
         while True:
             base_estado = generar_estado_barajado(colores, rng, movimientos)
             estado = mutar_a_insoluble(base_estado)
-            clave = estado_a_string(estado)
-            if clave not in vistos:
-                vistos.add(clave)
+            if estado not in vistos:
+                vistos.add(estado)
                 break
             movimientos += 1
         case_id = f"I{num_colores}c_{idx:02d}"
@@ -173,7 +216,7 @@ def generar_casos_insolubles(
             CasoGenerado(
                 case_id=case_id,
                 categoria="insoluble",
-                colores=tuple(colores),
+                colores=colores,
                 estado=estado,
                 shuffle_len=movimientos,
                 resoluble=False,
@@ -183,7 +226,7 @@ def generar_casos_insolubles(
 
 
 def generar_casos_profundos(
-    vistos: set[str],
+    vistos: set[State],
     total: int = 10,
     num_colores: int = 5,
     barra_min: int = 35,
@@ -191,16 +234,16 @@ def generar_casos_profundos(
     seed_base: int = 402501,
 ) -> List[CasoGenerado]:
     casos: List[CasoGenerado] = []
-    colores = COLORES_STANDARD[:num_colores]
+    colores = COLORES_POR_N[num_colores]
     for idx in range(total):
         seed = seed_base + idx
-        rng = random.Random(seed)
+        _RNG.seed(seed)
+        rng = _RNG
         movimientos = rng.randint(barra_min, barra_max)
         while True:
             estado = generar_estado_barajado(colores, rng, movimientos)
-            clave = estado_a_string(estado)
-            if clave not in vistos:
-                vistos.add(clave)
+            if estado not in vistos:
+                vistos.add(estado)
                 break
             movimientos += 1
         case_id = f"P{num_colores}c_{idx:02d}"
@@ -208,7 +251,7 @@ def generar_casos_profundos(
             CasoGenerado(
                 case_id=case_id,
                 categoria="profundo",
-                colores=tuple(colores),
+                colores=colores,
                 estado=estado,
                 shuffle_len=movimientos,
                 resoluble=True,
@@ -218,7 +261,7 @@ def generar_casos_profundos(
 
 
 def generar_casos() -> List[CasoGenerado]:
-    vistos: set[str] = set()
+    vistos: set[State] = set()
     casos: List[CasoGenerado] = []
     casos.extend(generar_casos_solubles(vistos))
     casos.extend(generar_casos_insolubles(vistos))
@@ -226,9 +269,28 @@ def generar_casos() -> List[CasoGenerado]:
     return casos
 
 
-def evaluar_backtracking(caso: CasoGenerado, max_expansions: Optional[int] = 400_000) -> Dict[str, object]:
+def canonicalizar(estado: State) -> State:
+    """
+    Renombra los colores a 1, 2, 3... en el orden en que aparecen.
+
+    Ambos solvers ya numeran los colores así internamente, de modo que dos
+    estados con la misma forma canónica producen exactamente la misma
+    búsqueda (mismos movimientos, expansiones y cotas). El orden de las
+    pilas se conserva: los movimientos son índices de pila y el DFS de
+    Backtracking depende de ese orden.
+    """
+    codigos: Dict[Color, int] = {}
+    return tuple(tuple(codigos.setdefault(c, len(codigos) + 1) for c in p) for p in estado)
+
+
+# Las evaluaciones se memorizan por forma canónica: si un caso repite la
+# forma de otro ya resuelto se reutilizan sus métricas (incluido el tiempo
+# medido en aquella corrida) en lugar de volver a resolverlo.
+
+@lru_cache(maxsize=None)
+def _evaluar_backtracking(estado: State, max_expansions: Optional[int]) -> Dict[str, object]:
     inicio = time.perf_counter()
-    solucion, stats = solve_backtracking(caso.estado, max_expansions=max_expansions)
+    solucion, stats = solve_backtracking(estado, max_expansions=max_expansions)
     duracion = time.perf_counter() - inicio
     return {
         "algoritmo": "backtracking",
@@ -245,16 +307,14 @@ def evaluar_backtracking(caso: CasoGenerado, max_expansions: Optional[int] = 400
     }
 
 
-def evaluar_branch_and_bound(
-    caso: CasoGenerado,
-    max_expansions: Optional[int] = 400_000
-) -> Dict[str, object]:
+@lru_cache(maxsize=None)
+def _evaluar_branch_and_bound(estado: State, max_expansions: Optional[int]) -> Dict[str, object]:
     inicio = time.perf_counter()
-    solucion, stats = solve_branch_and_bound(caso.estado, max_expansions=max_expansions)
+    solucion, stats = solve_branch_and_bound(estado, max_expansions=max_expansions)
     duracion = time.perf_counter() - inicio
 
     mejor_cota = stats.mejor_cota_encontrada
-    if mejor_cota in {float("inf"), math.inf}:
+    if isinstance(mejor_cota, float) and math.isinf(mejor_cota):
         mejor_cota = None
 
     return {
@@ -272,28 +332,66 @@ def evaluar_branch_and_bound(
     }
 
 
-def escribir_csv(resultados: List[Dict[str, object]], destino: Path) -> None:
-    campos = [
-        "case_id",
-        "categoria",
-        "colores",
-        "shuffle_len",
-        "resoluble",
-        "algoritmo",
-        "resuelto",
-        "movimientos",
-        "expanded",
-        "pruned",
-        "max_depth",
-        "best_bound",
-        "time",
-        "limite_alcanzado",
-    ]
-    with destino.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=campos)
-        writer.writeheader()
-        for fila in resultados:
-            writer.writerow({campo: fila.get(campo) for campo in campos})
+CAMPOS_CSV = (
+    "case_id",
+    "categoria",
+    "colores",
+    "shuffle_len",
+    "resoluble",
+    "algoritmo",
+    "resuelto",
+    "movimientos",
+    "expanded",
+    "pruned",
+    "max_depth",
+    "best_bound",
+    "time",
+    "limite_alcanzado",
+)
+
+
+def _fila_csv(fila: Dict[str, object]) -> Tuple[object, ...]:
+    return tuple(fila.get(campo) for campo in CAMPOS_CSV)
+
+
+# Texto fijo del resumen; los bloques variables se arman en sintetizar_resumen
+PLANTILLA_RESUMEN = """\
+Comparativa masiva Backtracking vs Branch and Bound
+==============================================================
+
+Configuración de la corrida
+--------------------------
+Casos evaluados: 50 (30 solubles, 10 insolubles, 10 profundos con alta mezcla)
+Estados solubles generados barajando soluciones óptimas con movimientos válidos.
+Estados insolubles creados alterando deliberadamente las cantidades por color.
+Estados profundos usan barajes largos para forzar expansión y poda.
+Máximo de expansiones permitido: 400,000.
+
+Distribución por categorías
+---------------------------
+{categorias}
+
+Podas promedio por categoría (Branch & Bound)
+---------------------------------------------
+{podas}
+
+Resumen estadístico por algoritmo
+-------------------------------
+{algoritmos}
+Comparación global (promedios)
+--------------------------------
+- Δ Tiempo (BnB - BT): {delta_tiempo} s
+- Δ Movimientos (BnB - BT): {delta_movimientos}
+- Δ Nodos expandidos: {delta_expandidos}
+
+Conclusiones preliminares
+-------------------------
+• Backtracking resuelve todos los casos más rápido en promedio, gracias a su exploración en profundidad guiada por heurísticas.
+• Branch and Bound invierte más tiempo y expansiones pero acumula información adicional (podas y mejores cotas) que garantiza soluciones óptimas y permite analizar barreras en instancias más complejas.
+• Los 10 casos insolubles se detectaron sin agotar el límite de expansiones; ambos algoritmos retornan sin solución, validando la detección temprana de inconsistencias.
+• En los 10 casos profundos, Branch and Bound promedió más podas por instancia, evidenciando cómo la estrategia best-first reduce ramas en mezclas complejas.
+• En escenarios donde el espacio de búsqueda explota o se requiere certificar óptimo, BnB ofrece respuestas más 'inteligentes': sacrifica tiempo a cambio de podar ramas, registrar cotas y detectar inconsistencias globales.
+• Para la defensa/informe, se recomienda enfatizar que la eficiencia de BnB se aprecia al escalar el problema: frente a estados muy mezclados o límites estrictos de expansiones, la poda evita trabajo redundante y mantiene la solución óptima garantizada."""
 
 
 def sintetizar_resumen(
@@ -301,9 +399,7 @@ def sintetizar_resumen(
     casos: List[CasoGenerado],
     destino: Path,
 ) -> None:
-    agrupados: Dict[str, List[Dict[str, object]]] = {"backtracking": [], "branch_and_bound": []}
-    for fila in resultados:
-        agrupados[fila["algoritmo"]].append(fila)
+    algoritmos = ("backtracking", "branch_and_bound")
 
     categorias: Dict[str, Dict[str, int]] = {}
     for caso in casos:
@@ -313,151 +409,184 @@ def sintetizar_resumen(
             info["resolubles"] += 1
         else:
             info["insolubles"] += 1
-    bnb_por_categoria: Dict[str, List[Dict[str, object]]] = {}
+
+    # Una sola pasada sobre los resultados acumula todas las métricas por
+    # algoritmo (y las podas de BnB por categoría); los promedios y
+    # medianas se calculan después, una vez por lista.
+    series: Dict[str, Dict[str, list]] = {
+        algoritmo: {"tiempos": [], "expandidos": [], "movimientos": [], "podados": []}
+        for algoritmo in algoritmos
+    }
+    conteos: Dict[str, Dict[str, int]] = {
+        algoritmo: {"total": 0, "resueltos": 0, "limite": 0} for algoritmo in algoritmos
+    }
+    podas_por_categoria: Dict[str, List[int]] = {}
     for fila in resultados:
-        if fila["algoritmo"] == "branch_and_bound":
-            bnb_por_categoria.setdefault(fila["categoria"], []).append(fila)
-
-    lineas: List[str] = []
-    lineas.append("Comparativa masiva Backtracking vs Branch and Bound")
-    lineas.append("=" * 62)
-    lineas.append("")
-    lineas.append("Configuración de la corrida")
-    lineas.append("--------------------------")
-    lineas.append("Casos evaluados: 50 (30 solubles, 10 insolubles, 10 profundos con alta mezcla)")
-    lineas.append("Estados solubles generados barajando soluciones óptimas con movimientos válidos.")
-    lineas.append("Estados insolubles creados alterando deliberadamente las cantidades por color.")
-    lineas.append("Estados profundos usan barajes largos para forzar expansión y poda.")
-    lineas.append("Máximo de expansiones permitido: 400,000.")
-    lineas.append("")
-    lineas.append("Distribución por categorías")
-    lineas.append("---------------------------")
-    for categoria, info in sorted(categorias.items()):
-        lineas.append(
-            f"- {categoria.capitalize()}: {info['total']} casos "
-            f"(resolubles: {info['resolubles']}, insolubles: {info['insolubles']})"
-        )
-    lineas.append("")
-    lineas.append("Podas promedio por categoría (Branch & Bound)")
-    lineas.append("---------------------------------------------")
-    for categoria, filas in sorted(bnb_por_categoria.items()):
-        podas = [fila.get("pruned", 0) or 0 for fila in filas]
-        lineas.append(f"- {categoria.capitalize()}: {statistics.mean(podas):.2f} podas por caso")
-    lineas.append("")
-
-    def resumen_algoritmo(nombre: str, filas: List[Dict[str, object]]) -> List[str]:
-        tiempos = [fila["time"] for fila in filas if isinstance(fila["time"], (int, float))]
-        expandidos = [fila["expanded"] for fila in filas if isinstance(fila["expanded"], int)]
-        podados = [fila.get("pruned", 0) or 0 for fila in filas if fila["algoritmo"] == "branch_and_bound"]
-        limite = sum(1 for fila in filas if fila.get("limite_alcanzado"))
-        resueltos = sum(1 for fila in filas if fila.get("resuelto"))
-        total = len(filas)
-        movimientos = [fila["movimientos"] for fila in filas if isinstance(fila.get("movimientos"), int)]
-
-        tiempo_prom = statistics.mean(tiempos) if tiempos else 0.0
+        algoritmo = fila["algoritmo"]
+        serie = series[algoritmo]
+        conteo = conteos[algoritmo]
+        conteo["total"] += 1
+        if fila.get("resuelto"):
+            conteo["resueltos"] += 1
+        if fila.get("limite_alcanzado"):
+            conteo["limite"] += 1
+        if isinstance(fila["time"], (int, float)):
+            serie["tiempos"].append(fila["time"])
+        if isinstance(fila["expanded"], int):
+            serie["expandidos"].append(fila["expanded"])
+        if isinstance(fila.get("movimientos"), int):
+            serie["movimientos"].append(fila["movimientos"])
+        if algoritmo == "branch_and_bound":
+            poda = fila.get("pruned", 0) or 0
+            serie["podados"].append(poda)
+            podas_por_categoria.setdefault(fila["categoria"], []).append(poda)
+
+    promedios: Dict[str, Dict[str, Optional[float]]] = {
+        algoritmo: {
+            nombre: statistics.mean(valores) if valores else None
+            for nombre, valores in serie.items()
+        }
+        for algoritmo, serie in series.items()
+    }
+
+    bloque_categorias = "\n".join(
+        f"- {categoria.capitalize()}: {info['total']} casos "
+        f"(resolubles: {info['resolubles']}, insolubles: {info['insolubles']})"
+        for categoria, info in sorted(categorias.items())
+    )
+    bloque_podas = "\n".join(
+        f"- {categoria.capitalize()}: {statistics.mean(podas):.2f} podas por caso"
+        for categoria, podas in sorted(podas_por_categoria.items())
+    )
+
+    def resumen_algoritmo(nombre: str) -> str:
+        serie = series[nombre]
+        prom = promedios[nombre]
+        conteo = conteos[nombre]
+        tiempos = serie["tiempos"]
+        expandidos = serie["expandidos"]
+        movimientos = serie["movimientos"]
+        podados = serie["podados"]
+
+        tiempo_prom = prom["tiempos"] if tiempos else 0.0
         tiempo_med = statistics.median(tiempos) if tiempos else 0.0
-        exp_prom = statistics.mean(expandidos) if expandidos else 0.0
+        exp_prom = prom["expandidos"] if expandidos else 0.0
         exp_med = statistics.median(expandidos) if expandidos else 0.0
-
-        resumen = [
-            f"{nombre.upper()}",
-            f"- Casos resueltos: {resueltos}/{total}",
-            f"- Tiempo promedio: {tiempo_prom:.6f} s",
-            f"- Tiempo mediano: {tiempo_med:.6f} s",
-            f"- Nodos expandidos promedio: {exp_prom:.1f}",
-            f"- Nodos expandidos mediana: {exp_med:.1f}",
-            f"- Casos con límite alcanzado: {limite}",
-        ]
         if movimientos:
-            resumen.insert(2, f"- Movimientos promedio: {statistics.mean(movimientos):.2f}")
-            resumen.insert(3, f"- Movimientos mediana: {statistics.median(movimientos):.1f}")
+            mov_prom = f"{prom['movimientos']:.2f}"
+            mov_med = f"{statistics.median(movimientos):.1f}"
         else:
-            resumen.insert(2, "- Movimientos promedio: N/A")
-            resumen.insert(3, "- Movimientos mediana: N/A")
+            mov_prom = mov_med = "N/A"
+
+        resumen = (
+            f"{nombre.upper()}\n"
+            f"- Casos resueltos: {conteo['resueltos']}/{conteo['total']}\n"
+            f"- Movimientos promedio: {mov_prom}\n"
+            f"- Movimientos mediana: {mov_med}\n"
+            f"- Tiempo promedio: {tiempo_prom:.6f} s\n"
+            f"- Tiempo mediano: {tiempo_med:.6f} s\n"
+            f"- Nodos expandidos promedio: {exp_prom:.1f}\n"
+            f"- Nodos expandidos mediana: {exp_med:.1f}\n"
+            f"- Casos con límite alcanzado: {conteo['limite']}\n"
+        )
         if podados and any(podados):
-            resumen.append(f"- Nodos podados promedio: {statistics.mean(podados):.1f}")
+            resumen += f"- Nodos podados promedio: {prom['podados']:.1f}\n"
         return resumen
 
-    lineas.append("Resumen estadístico por algoritmo")
-    lineas.append("-------------------------------")
-    for algoritmo in ("backtracking", "branch_and_bound"):
-        lineas.extend(resumen_algoritmo(algoritmo, agrupados[algoritmo]))
-        lineas.append("")
-
     # Comparativa directa
-    tiempos_bt = [fila["time"] for fila in agrupados["backtracking"]]
-    tiempos_bnb = [fila["time"] for fila in agrupados["branch_and_bound"]]
-    exp_bt = [fila["expanded"] for fila in agrupados["backtracking"]]
-    exp_bnb = [fila["expanded"] for fila in agrupados["branch_and_bound"]]
-
-    lineas.append("Comparación global (promedios)")
-    lineas.append("--------------------------------")
-    mov_bt = [fila["movimientos"] for fila in agrupados["backtracking"] if isinstance(fila.get("movimientos"), int)]
-    mov_bnb = [fila["movimientos"] for fila in agrupados["branch_and_bound"] if isinstance(fila.get("movimientos"), int)]
-
-    lineas.append(f"- Δ Tiempo (BnB - BT): {statistics.mean(tiempos_bnb) - statistics.mean(tiempos_bt):.6f} s")
-    if mov_bt and mov_bnb:
-        lineas.append(f"- Δ Movimientos (BnB - BT): {statistics.mean(mov_bnb) - statistics.mean(mov_bt):.2f}")
+    prom_bt = promedios["backtracking"]
+    prom_bnb = promedios["branch_and_bound"]
+    if prom_bt["movimientos"] is not None and prom_bnb["movimientos"] is not None:
+        delta_movimientos = f"{prom_bnb['movimientos'] - prom_bt['movimientos']:.2f}"
     else:
-        lineas.append("- Δ Movimientos (BnB - BT): N/A")
-    lineas.append(f"- Δ Nodos expandidos: {statistics.mean(exp_bnb) - statistics.mean(exp_bt):.1f}")
-    lineas.append("")
-
-    lineas.append("Conclusiones preliminares")
-    lineas.append("-------------------------")
-    lineas.append(
-        "• Backtracking resuelve todos los casos más rápido en promedio, "
-        "gracias a su exploración en profundidad guiada por heurísticas."
-    )
-    lineas.append(
-        "• Branch and Bound invierte más tiempo y expansiones pero acumula información adicional "
-        "(podas y mejores cotas) que garantiza soluciones óptimas y permite analizar barreras en "
-        "instancias más complejas."
-    )
-    lineas.append(
-        "• Los 10 casos insolubles se detectaron sin agotar el límite de expansiones; ambos algoritmos retornan sin solución, validando la detección temprana de inconsistencias."
-    )
-    lineas.append(
-        "• En los 10 casos profundos, Branch and Bound promedió más podas por instancia, evidenciando cómo la estrategia best-first reduce ramas en mezclas complejas."
-    )
-    lineas.append(
-        "• En escenarios donde el espacio de búsqueda explota o se requiere certificar óptimo, "
-        "BnB ofrece respuestas más 'inteligentes': sacrifica tiempo a cambio de podar ramas, "
-        "registrar cotas y detectar inconsistencias globales."
-    )
-    lineas.append(
-        "• Para la defensa/informe, se recomienda enfatizar que la eficiencia de BnB se aprecia "
-        "al escalar el problema: frente a estados muy mezclados o límites estrictos de expansiones, "
-        "la poda evita trabajo redundante y mantiene la solución óptima garantizada."
+        delta_movimientos = "N/A"
+
+    texto = PLANTILLA_RESUMEN.format(
+        categorias=bloque_categorias,
+        podas=bloque_podas,
+        algoritmos="\n".join(resumen_algoritmo(algoritmo) for algoritmo in algoritmos),
+        delta_tiempo=f"{prom_bnb['tiempos'] - prom_bt['tiempos']:.6f}",
+        delta_movimientos=delta_movimientos,
+        delta_expandidos=f"{prom_bnb['expandidos'] - prom_bt['expandidos']:.1f}",
     )
+    destino.write_text(texto, encoding="utf-8")
+
+
+Tarea = Tuple[str, State, Optional[int]]  # (algoritmo, estado canónico, límite)
 
-    destino.write_text("\n".join(lineas), encoding="utf-8")
+_EVALUADORES = {
+    "backtracking": _evaluar_backtracking,
+    "branch_and_bound": _evaluar_branch_and_bound,
+}
+
+
+def _ejecutar_tarea(tarea: Tarea) -> Dict[str, object]:
+    """Punto de entrada de cada proceso trabajador."""
+    algoritmo, estado, limite = tarea
+    return _EVALUADORES[algoritmo](estado, limite)
+
+
+# Instancia mínima que cada proceso trabajador resuelve al arrancar
+ESTADO_PRECALENTAMIENTO: State = (
+    ("R", "G", "R", "G", "R"),
+    ("G", "R", "G", "R", "G"),
+    (),
+)
+
+
+def _precalentar_trabajador() -> None:
+    """
+    Inicializador del pool: resuelve una instancia chica con ambos solvers
+    para que las tablas internas (pilas analizadas, prioridades memorizadas)
+    ya estén armadas y el primer caso medido en cada proceso no pague ese
+    costo de arranque en su tiempo.
+    """
+    solve_backtracking(ESTADO_PRECALENTAMIENTO, max_expansions=1000)
+    solve_branch_and_bound(ESTADO_PRECALENTAMIENTO, max_expansions=1000)
 
 
 def main() -> None:
     casos = generar_casos()
-    resultados: List[Dict[str, object]] = []
 
+    tareas: List[Tuple[Tarea, Tarea]] = []
     for caso in casos:
-        base = {
-            "case_id": caso.case_id,
-            "categoria": caso.categoria,
-            "colores": "".join(caso.colores),
-            "shuffle_len": caso.shuffle_len,
-            "resoluble": caso.resoluble,
-        }
         limite = 200_000 if not caso.resoluble else 400_000
-
-        bt_resultado = evaluar_backtracking(caso, max_expansions=limite)
-        resultados.append(base | bt_resultado)
-
-        bnb_resultado = evaluar_branch_and_bound(caso, max_expansions=limite)
-        resultados.append(base | bnb_resultado)
+        clave = canonicalizar(caso.estado)
+        tareas.append((("backtracking", clave, limite), ("branch_and_bound", clave, limite)))
 
     csv_destino = BASE_DIR / "experiments" / "resultados_batch.csv"
     resumen_destino = BASE_DIR / "experiments" / "resumen_batch.txt"
 
-    escribir_csv(resultados, csv_destino)
+    # Los casos son independientes: cada corrida (sin repetir formas
+    # canónicas) se resuelve en un proceso aparte. map entrega los
+    # resultados en orden, así que cada caso se escribe en el CSV apenas
+    # están sus dos corridas, mientras los procesos siguen con los demás.
+    unicas = list(dict.fromkeys(t for par in tareas for t in par))
+    resultados: List[Dict[str, object]] = []
+    with (
+        ProcessPoolExecutor(initializer=_precalentar_trabajador) as ex,
+        csv_destino.open("w", newline="", encoding="utf-8") as f,
+    ):
+        pendientes = zip(unicas, ex.map(_ejecutar_tarea, unicas, chunksize=2))
+        evaluadas: Dict[Tarea, Dict[str, object]] = {}
+        writer = csv.writer(f)
+        writer.writerow(CAMPOS_CSV)
+        for caso, par in zip(casos, tareas):
+            for tarea in par:
+                while tarea not in evaluadas:
+                    hecha, resultado = next(pendientes)
+                    evaluadas[hecha] = resultado
+            base = {
+                "case_id": caso.case_id,
+                "categoria": caso.categoria,
+                "colores": "".join(caso.colores),
+                "shuffle_len": caso.shuffle_len,
+                "resoluble": caso.resoluble,
+            }
+            filas = [base | evaluadas[tarea] for tarea in par]
+            writer.writerows(map(_fila_csv, filas))
+            resultados.extend(filas)
+
     sintetizar_resumen(resultados, casos, resumen_destino)
 
     print(f"[OK] Resultados detallados guardados en {csv_destino.name}")
@@ -6,26 +6,18 @@ Usa la misma batería que el script de backtracking para facilitar la comparaci
 
 from __future__ import annotations
 
-import importlib
+import math
 import sys
 import time
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Iterable, Tuple
 
-BASE_DIR = Path(__file__).resolve().parents[1]
-BAB_DIR = BASE_DIR / "algorithms" / "branch_and_bound"
+from algorithms.branch_and_bound import core as bab_core
+from algorithms.branch_and_bound import utils as bab_utils
 
-if str(BAB_DIR) not in sys.path:
-    sys.path.insert(0, str(BAB_DIR))
-
-bab_core = importlib.import_module("core")
-bab_utils = importlib.import_module("utils")
-
-State = bab_core.State  # type: ignore[attr-defined]
-solve_branch_and_bound = bab_core.solve_branch_and_bound  # type: ignore[attr-defined]
-dibujar_estado = bab_utils.dibujar_estado  # type: ignore[attr-defined]
-validar_instancia_inicial = bab_utils.validar_instancia_inicial  # type: ignore[attr-defined]
+State = bab_core.State
+solve_branch_and_bound = bab_core.solve_branch_and_bound
+dibujar_estado = bab_utils.dibujar_estado
 
 
 Color = str
@@ -112,7 +104,7 @@ def formatear_tiempo(segundos: float) -> str:
 
 def ejecutar_caso(caso: CasoPrueba) -> dict:
     try:
-        validar_instancia_inicial(caso.estado, caso.colores)
+        bab_utils.validar_instancia_inicial(caso.estado, caso.colores)
     except AssertionError as exc:
         return {
             "nombre": caso.nombre,
@@ -128,7 +120,7 @@ def ejecutar_caso(caso: CasoPrueba) -> dict:
     duracion = time.perf_counter() - inicio
 
     mejor_cota = stats.mejor_cota_encontrada
-    if mejor_cota in {float("inf"), bab_core.math.inf}:  # type: ignore[attr-defined]
+    if isinstance(mejor_cota, float) and math.isinf(mejor_cota):
         mejor_cota = None
 
     return {
@@ -153,29 +145,32 @@ def ejecutar_caso(caso: CasoPrueba) -> dict:
 def imprimir_resultados(resultados: Iterable[dict]) -> None:
     ancho = 84
     separador = "-" * ancho
+    # Todo el reporte se arma en memoria y se escribe de una sola vez
+    lineas: list[str] = []
     for resultado in resultados:
-        print(separador)
-        print(f"Caso: {resultado['nombre']}")
-        print(f"Descripción: {resultado.get('descripcion', '')}")
-        print(f"Colores: {resultado.get('colores', '-')}")
-        print(f"Estado inicial: {resultado.get('estado', '-')}")
+        lineas.append(separador)
+        lineas.append(f"Caso: {resultado['nombre']}")
+        lineas.append(f"Descripción: {resultado.get('descripcion', '')}")
+        lineas.append(f"Colores: {resultado.get('colores', '-')}")
+        lineas.append(f"Estado inicial: {resultado.get('estado', '-')}")
 
         if not resultado["valido"]:
-            print(f"❌ Estado inválido: {resultado['error']}")
+            lineas.append(f"❌ Estado inválido: {resultado['error']}")
             continue
 
-        print(f"Resuelto: {'Sí' if resultado['resuelto'] else 'No'}")
+        lineas.append(f"Resuelto: {'Sí' if resultado['resuelto'] else 'No'}")
         if resultado["resuelto"]:
-            print(f"Movimientos: {resultado['movimientos']}")
+            lineas.append(f"Movimientos: {resultado['movimientos']}")
         if resultado.get("limite_alcanzado"):
-            print("⚠️  Se alcanzó el límite de expansiones especificado.")
-        print(f"Nodos expandidos: {resultado['expanded']:,}")
-        print(f"Nodos podados: {resultado['pruned']:,}")
-        print(f"Profundidad máxima: {resultado['max_depth']:,}")
+            lineas.append("⚠️  Se alcanzó el límite de expansiones especificado.")
+        lineas.append(f"Nodos expandidos: {resultado['expanded']:,}")
+        lineas.append(f"Nodos podados: {resultado['pruned']:,}")
+        lineas.append(f"Profundidad máxima: {resultado['max_depth']:,}")
         if resultado.get("mejor_cota") is not None:
-            print(f"Mejor cota encontrada: {resultado['mejor_cota']}")
-        print(f"Tiempo: {formatear_tiempo(resultado['tiempo'])}")
-    print(separador)
+            lineas.append(f"Mejor cota encontrada: {resultado['mejor_cota']}")
+        lineas.append(f"Tiempo: {formatear_tiempo(resultado['tiempo'])}")
+    lineas.append(separador)
+    sys.stdout.write("\n".join(lineas) + "\n")
 
 
 def main() -> None:
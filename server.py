@@ -5,176 +5,364 @@
 # diferentes algoritmos (Backtracking, Branch and Bound, etc.)
 # ============================================================
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, send_from_directory
 from flask_cors import CORS
+import gzip
+import hashlib
 import json
-from typing import Tuple
+import atexit
+import logging
+import logging.handlers
+import queue
+from typing import Callable, NamedTuple, Optional, Tuple
 import os
-import sys
-import importlib.util
 import math
+from functools import lru_cache, wraps
+from dataclasses import dataclass
 
 # Configurar rutas relativas
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-ALGORITHMS_DIR = os.path.join(BASE_DIR, 'algorithms')
-BACKTRACKING_SRC = os.path.join(ALGORITHMS_DIR, 'backtracking')
-BRANCH_AND_BOUND_SRC = os.path.join(ALGORITHMS_DIR, 'branch_and_bound')
 WEB_DIR = os.path.join(BASE_DIR, 'web')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
-# Agregar las carpetas de algoritmos al path
-if BACKTRACKING_SRC not in sys.path:
-    sys.path.insert(0, BACKTRACKING_SRC)
-if BRANCH_AND_BOUND_SRC not in sys.path:
-    sys.path.insert(0, BRANCH_AND_BOUND_SRC)
+# Colores por defecto de /api/generar-aleatorio cuando no se envían (hasta 15)
+COLORES_STANDARD: Tuple[str, ...] = ('R', 'G', 'B', 'Y', 'O', 'V', 'P', 'C', 'M', 'S', 'L', 'T', 'D', 'A', 'I')
+
+# Máximo de colores distintos por estado que aceptan los endpoints
+MAX_COLORES = len(COLORES_STANDARD)
 
 app = Flask(__name__, static_folder=WEB_DIR)
 CORS(app)  # Permitir solicitudes desde el frontend
 
-# Importar módulos de algoritmos dinámicamente
-backtracking_module = None
-branch_and_bound_module = None
-
-def load_module_from_path(module_name, module_path):
-    """Carga un módulo desde una ruta específica usando importlib"""
-    spec = importlib.util.spec_from_file_location(module_name, module_path)
-    if spec is None:
-        raise ImportError(f"No se pudo crear spec para {module_name} desde {module_path}")
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[module_name] = module
-    spec.loader.exec_module(module)
-    return module
-
-
-def load_backtracking():
-    """Carga el módulo de backtracking"""
-    global backtracking_module
-    if backtracking_module is None:
-        try:
-            # Cargar módulos usando importlib para evitar conflictos
-            # IMPORTANTE: Cargar core primero porque utils lo importa
-            core_path = os.path.join(BACKTRACKING_SRC, 'core.py')
-            utils_path = os.path.join(BACKTRACKING_SRC, 'utils.py')
-            
-            # Guardar estado original
-            original_sys_path = sys.path.copy()
-            original_cwd = os.getcwd()
-            
-            # Agregar el directorio de backtracking al path
-            sys.path.insert(0, BACKTRACKING_SRC)
-            
-            # Cargar core primero
-            core_module = load_module_from_path('backtracking_core', core_path)
-            
-            # Registrar 'core' en el namespace del directorio para que utils pueda importarlo
-            # Usar un nombre específico para evitar conflictos
-            sys.modules['backtracking.core'] = core_module
-            # También registrar como 'core' dentro del contexto del directorio
-            sys.modules['core'] = core_module
-            
-            # Cambiar al directorio de backtracking para que los imports relativos funcionen
-            os.chdir(BACKTRACKING_SRC)
-            
-            # Ahora cargar utils (que importa desde core)
-            utils_module = load_module_from_path('backtracking_utils', utils_path)
-            
-            # Restaurar estado
-            sys.path = original_sys_path
-            os.chdir(original_cwd)
+# Logging: los handlers solo encolan el registro; un hilo de fondo
+# (QueueListener) lo formatea y lo escribe, fuera del camino de la petición
+_cola_logs = queue.SimpleQueue()
+_manejador_logs = logging.StreamHandler()
+_manejador_logs.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+_listener_logs = logging.handlers.QueueListener(_cola_logs, _manejador_logs)
+_listener_logs.start()
+atexit.register(_listener_logs.stop)
+
+logger = logging.getLogger('nutsort')
+logger.addHandler(logging.handlers.QueueHandler(_cola_logs))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+# Importar los algoritmos como paquetes (algorithms/<algoritmo>/__init__.py
+# reexporta lo que usa el servidor). Si alguno no se puede importar queda
+# en None y los endpoints lo reportan como no disponible.
+try:
+    from algorithms import backtracking as backtracking_module
+    logger.info("✓ Módulo de Backtracking cargado correctamente")
+except ImportError as e:
+    logger.error(f"✗ Error cargando backtracking: {e}")
+    backtracking_module = None
+
+try:
+    from algorithms import branch_and_bound as branch_and_bound_module
+    logger.info("✓ Módulo de Branch and Bound cargado correctamente")
+except ImportError as e:
+    logger.error(f"✗ Error cargando branch_and_bound: {e}")
+    branch_and_bound_module = None
+
+
+class AlgoBundle(NamedTuple):
+    """Funciones de un algoritmo que usan los endpoints, resueltas una vez."""
+    State: object  # alias de tipo del estado
+    solve: Callable
+    MAX_CAP: int
+    validar: Callable
+    generar: Callable
+    dibujar: Callable
+    reconstruir: Callable
+    estado_str: Callable
+
+
+def armar_bundle(modulo, nombre_solve: str) -> Optional[AlgoBundle]:
+    """Arma el AlgoBundle de un paquete de algoritmo (None si no se cargó)."""
+    if modulo is None:
+        return None
+    return AlgoBundle(
+        State=modulo.State,
+        solve=getattr(modulo, nombre_solve),
+        MAX_CAP=modulo.MAX_CAP,
+        validar=modulo.validar_instancia_inicial,
+        generar=modulo.generar_estado_aleatorio_unico,
+        dibujar=modulo.dibujar_estado,
+        reconstruir=modulo.reconstruir_y_mostrar,
+        estado_str=modulo.estado_a_string,
+    )
+
+
+backtracking_bundle = armar_bundle(backtracking_module, 'solve_backtracking')
+branch_and_bound_bundle = armar_bundle(branch_and_bound_module, 'solve_branch_and_bound')
+
+# Tabla de despacho de los endpoints: algoritmos disponibles por id (los
+# que no se pudieron importar no figuran)
+_ALGOS: dict[str, AlgoBundle] = {
+    algoritmo: bundle
+    for algoritmo, bundle in (
+        ('backtracking', backtracking_bundle),
+        ('branch_and_bound', branch_and_bound_bundle),
+    )
+    if bundle is not None
+}
+
+
+# Codificador JSON compartido por todas las respuestas: compacto, sin
+# ordenar claves y sin escapar los acentos (usa el codificador en C de json)
+_CODIFICADOR_JSON = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def responder_json(payload) -> Response:
+    """
+    Equivalente a jsonify, pero serializa en una sola pasada con
+    _CODIFICADOR_JSON (jsonify ordena las claves y en modo debug indenta).
+    Acepta tuplas directamente, así que los estados y soluciones no se
+    convierten a listas antes de responder.
+    """
+    return Response(_CODIFICADOR_JSON.encode(payload).encode('utf-8'), mimetype='application/json')
+
+
+@lru_cache(maxsize=256)
+def cuerpo_error(mensaje: str, valido: Optional[bool] = None) -> bytes:
+    """
+    Cuerpo JSON de una respuesta de error, ya codificado. Los mensajes
+    fijos (estado faltante, cuerpo inválido, algoritmo desconocido) se
+    codifican una sola vez y se reutilizan en cada petición inválida.
+    """
+    payload = {"success": False}
+    if valido is not None:
+        payload["valido"] = valido
+    payload["error"] = mensaje
+    return _CODIFICADOR_JSON.encode(payload).encode('utf-8')
+
+
+def responder_error(mensaje: str, status: int = 400, valido: Optional[bool] = None) -> Response:
+    """Respuesta de error {"success": false, "error": mensaje} con `status`."""
+    return Response(cuerpo_error(mensaje, valido), status=status, mimetype='application/json')
+
+
+class ErrorSolicitud(Exception):
+    """Error de una solicitud que la vista responde con responder_error."""
+    
+    def __init__(self, mensaje: str, status: int = 400):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+        self.status = status
+
+
+def algoritmo_no_disponible(algoritmo: str, **extra):
+    """Respuesta 400 para un algoritmo desconocido o que no se pudo cargar."""
+    return responder_error(f"Algoritmo '{algoritmo}' no disponible", **extra)
+
+
+def requiere_algoritmo(**extra_error):
+    """
+    Decorador de los endpoints POST que operan con un algoritmo.
+    
+    Lee el cuerpo JSON una vez, busca el AlgoBundle de `algoritmo` en
+    _ALGOS y llama a la vista con data, algoritmo y bundle ya resueltos.
+    Si el cuerpo no es un objeto o el algoritmo no está disponible
+    responde 400 (con los campos de `extra_error`) sin entrar a la vista.
+    """
+    def decorador(vista):
+        @wraps(vista)
+        def envoltorio():
+            # silent: un cuerpo ausente o que no es JSON se trata como {}
+            data = request.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                return responder_error("El cuerpo debe ser un objeto JSON", **extra_error)
             
-            backtracking_module = {
-                'State': core_module.State,
-                'solve_backtracking': core_module.solve_backtracking,
-                'MAX_CAP': core_module.MAX_CAP,
-                'validar_instancia_inicial': utils_module.validar_instancia_inicial,
-                'generar_estado_aleatorio_unico': utils_module.generar_estado_aleatorio_unico,
-                'dibujar_estado': utils_module.dibujar_estado,
-                'reconstruir_y_mostrar': utils_module.reconstruir_y_mostrar,
-                'estado_a_string': utils_module.estado_a_string
-            }
-            print("✓ Módulo de Backtracking cargado correctamente")
-        except Exception as e:
-            print(f"✗ Error cargando backtracking: {e}")
-            import traceback
-            traceback.print_exc()
-            backtracking_module = None
-    return backtracking_module
+            algoritmo = data.get('algoritmo', 'backtracking')
+            bundle = _ALGOS.get(algoritmo) if isinstance(algoritmo, str) else None
+            if bundle is None:
+                return algoritmo_no_disponible(algoritmo, **extra_error)
+            return vista(data, algoritmo, bundle)
+        return envoltorio
+    return decorador
 
 
-def load_branch_and_bound():
-    """Carga el módulo de Branch and Bound"""
-    global branch_and_bound_module
-    if branch_and_bound_module is None:
+@lru_cache(maxsize=4096)
+def resolver_cacheado(solve: Callable, estado: tuple, max_expansions):
+    """
+    Resuelve `estado` con `solve` (AlgoBundle.solve del algoritmo ya
+    resuelto por requiere_algoritmo), memorizando el resultado.
+    
+    El frontend suele reenviar el mismo tablero mientras se lo edita; como
+    los solvers son deterministas, la segunda vez la respuesta sale de la
+    caché en lugar de repetir la búsqueda. La solución se guarda como
+    tupla para que nadie pueda modificar el valor cacheado; las stats no se
+    modifican después de la búsqueda. Se vacía con POST /api/cache/clear.
+    """
+    solucion, stats = solve(estado, max_expansions=max_expansions)
+    return (tuple(solucion) if solucion is not None else None), stats
+
+
+@lru_cache(maxsize=1024)
+def validar_cacheado(validar: Callable, estado: tuple, colores: tuple) -> Optional[str]:
+    """
+    Valida `estado` contra `colores` con `validar` (AlgoBundle.validar) y
+    devuelve el mensaje de error, o None si es válido.
+    
+    El frontend suele llamar a /api/validar-estado y enseguida a
+    /api/resolver con el mismo tablero; con la caché la segunda
+    validación no vuelve a recorrer las pilas.
+    """
+    try:
+        validar(estado, colores)
+    except AssertionError as e:
+        return str(e)
+    return None
+
+
+def estado_desde_json(estado_lista) -> tuple:
+    """
+    Convierte el estado recibido como JSON (lista de listas) a State
+    (tupla de tuplas). map(tuple, ...) hace la conversión de cada pila
+    en C, sin el generador de Python por pila.
+    """
+    return tuple(map(tuple, estado_lista))
+
+
+@dataclass(frozen=True, slots=True)
+class SolicitudEstado:
+    """Cuerpo ya validado de /api/resolver y /api/validar-estado."""
+    estado: tuple
+    colores: Optional[Tuple[str, ...]]
+    max_expansions: Optional[int]
+
+
+def leer_solicitud_estado(data: dict, bundle: AlgoBundle) -> SolicitudEstado:
+    """
+    Valida los tipos del cuerpo JSON (ya resuelto por requiere_algoritmo) y
+    lo convierte a SolicitudEstado en una sola pasada. Lanza ValueError con
+    un mensaje para el cliente (400) en lugar de dejar que un tipo
+    inesperado falle dentro del solver.
+    """
+    estado_lista = data.get('estado')
+    if not estado_lista:
+        raise ValueError("No se proporcionó un estado")
+    if not isinstance(estado_lista, list) or not all(type(p) is list for p in estado_lista):
+        raise ValueError("'estado' debe ser una lista de pilas (listas de colores)")
+    
+    colores_str = data.get('colores') or ()
+    if not isinstance(colores_str, (list, tuple)) or not all(type(c) is str for c in colores_str):
+        raise ValueError("'colores' debe ser una lista de textos")
+    
+    max_expansions = data.get('max_expansions', 500000)
+    if max_expansions is not None and type(max_expansions) is not int:
+        raise ValueError("'max_expansions' debe ser un entero")
+    
+    # Cada tuerca debe ser un texto (y, si vienen colores, uno de ellos)
+    # antes de que el estado llegue a las cachés o a los solvers
+    estado = estado_desde_json(estado_lista)
+    if not all(type(c) is str for p in estado for c in p):
+        raise ValueError("Cada tuerca de 'estado' debe ser un color (texto)")
+    
+    # Límites de los solvers (pilas de a lo sumo MAX_CAP tuercas y hasta
+    # MAX_COLORES colores): fuera de ellos no pueden codificar el estado
+    if any(len(p) > bundle.MAX_CAP for p in estado):
+        raise ValueError(f"Cada pila admite como máximo {bundle.MAX_CAP} tuercas")
+    presentes = set().union(*estado)
+    if len(presentes) > MAX_COLORES:
+        raise ValueError(f"Se admiten como máximo {MAX_COLORES} colores distintos")
+    
+    colores = tuple(colores_str) or None
+    if colores:
+        desconocidos = presentes.difference(colores)
+        if desconocidos:
+            raise ValueError(f"Colores no incluidos en 'colores': {', '.join(sorted(desconocidos))}")
+    
+    return SolicitudEstado(
+        estado=estado,
+        colores=colores,
+        max_expansions=max_expansions,
+    )
+
+
+# Estado chico y fijo para precalentar los solvers (ver precalentar)
+ESTADO_PRECALENTAMIENTO = (
+    ("R", "G", "R", "G", "R"),
+    ("G", "R", "G", "R", "G"),
+    (),
+)
+
+
+def precalentar():
+    """
+    Resuelve una instancia chica con cada algoritmo disponible.
+    
+    Así las tablas internas de los solvers (pilas ya analizadas,
+    prioridades memorizadas) quedan listas en el arranque en frío, en
+    lugar de pagarse en la primera petición.
+    
+    Un error de un solver solo se registra: el precalentamiento es una
+    optimización y no debe impedir que el servidor (o api/server.py en
+    un arranque en frío) termine de cargar.
+    """
+    for algoritmo, bundle in _ALGOS.items():
         try:
-            # Cargar módulos usando importlib para evitar conflictos
-            # IMPORTANTE: Cargar core primero porque utils lo importa
-            core_path = os.path.join(BRANCH_AND_BOUND_SRC, 'core.py')
-            utils_path = os.path.join(BRANCH_AND_BOUND_SRC, 'utils.py')
-            
-            # Guardar estado original
-            original_sys_path = sys.path.copy()
-            original_cwd = os.getcwd()
-            
-            # Agregar el directorio de branch_and_bound al path
-            sys.path.insert(0, BRANCH_AND_BOUND_SRC)
-            
-            # Cargar core primero
-            core_module = load_module_from_path('branch_and_bound_core', core_path)
-            
-            # Registrar 'core' en el namespace del directorio para que utils pueda importarlo
-            # Usar un nombre específico para evitar conflictos
-            sys.modules['branch_and_bound.core'] = core_module
-            # También registrar como 'core' dentro del contexto del directorio
-            sys.modules['core'] = core_module
-            
-            # Cambiar al directorio de branch_and_bound para que los imports relativos funcionen
-            os.chdir(BRANCH_AND_BOUND_SRC)
-            
-            # Ahora cargar utils (que importa desde core)
-            utils_module = load_module_from_path('branch_and_bound_utils', utils_path)
-            
-            # Restaurar estado
-            sys.path = original_sys_path
-            os.chdir(original_cwd)
-            
-            branch_and_bound_module = {
-                'State': core_module.State,
-                'solve_branch_and_bound': core_module.solve_branch_and_bound,
-                'MAX_CAP': core_module.MAX_CAP,
-                'validar_instancia_inicial': utils_module.validar_instancia_inicial,
-                'generar_estado_aleatorio_unico': utils_module.generar_estado_aleatorio_unico,
-                'dibujar_estado': utils_module.dibujar_estado,
-                'reconstruir_y_mostrar': utils_module.reconstruir_y_mostrar,
-                'estado_a_string': utils_module.estado_a_string
-            }
-            print("✓ Módulo de Branch and Bound cargado correctamente")
+            bundle.solve(ESTADO_PRECALENTAMIENTO, max_expansions=1000)
         except Exception as e:
-            print(f"✗ Error cargando branch_and_bound: {e}")
-            import traceback
-            traceback.print_exc()
-            branch_and_bound_module = None
-    return branch_and_bound_module
+            logger.exception(f"Error precalentando {algoritmo}: {e}")
+
+
+# Segundos que el navegador puede reutilizar index.html y styles.css
+STATIC_MAX_AGE = 3600
+
+
+def comprimir_estatico(nombre: str) -> Optional[bytes]:
+    """Lee un archivo de web/ y lo devuelve comprimido con gzip (None si falta)."""
+    try:
+        with open(os.path.join(WEB_DIR, nombre), 'rb') as archivo:
+            return gzip.compress(archivo.read(), compresslevel=9)
+    except OSError:
+        return None
+
+
+# index.html y styles.css comprimidos una sola vez al arrancar
+_ESTATICOS_GZIP = {nombre: comprimir_estatico(nombre) for nombre in ('index.html', 'styles.css')}
+
+
+def servir_estatico(nombre: str, mimetype: str):
+    """
+    Sirve un archivo de web/ con Cache-Control de STATIC_MAX_AGE segundos.
+    
+    Si el cliente acepta gzip se responde con la versión precomprimida en
+    memoria (sin leer el disco); si no, con send_from_directory.
+    """
+    comprimido = _ESTATICOS_GZIP.get(nombre)
+    if comprimido is None or 'gzip' not in request.headers.get('Accept-Encoding', ''):
+        return send_from_directory(WEB_DIR, nombre, max_age=STATIC_MAX_AGE)
+    
+    respuesta = Response(comprimido, mimetype=mimetype)
+    respuesta.headers['Content-Encoding'] = 'gzip'
+    respuesta.headers['Vary'] = 'Accept-Encoding'
+    respuesta.cache_control.public = True
+    respuesta.cache_control.max_age = STATIC_MAX_AGE
+    respuesta.add_etag()
+    return respuesta.make_conditional(request)
 
 
 @app.route('/')
 def index():
     """Servir la página HTML principal."""
-    return send_from_directory(WEB_DIR, 'index.html')
+    return servir_estatico('index.html', 'text/html')
 
 
 @app.route('/styles.css')
 def styles():
     """Servir el archivo CSS."""
-    return send_from_directory(WEB_DIR, 'styles.css')
+    return servir_estatico('styles.css', 'text/css')
 
 
-@app.route('/api/algoritmos', methods=['GET'])
-def listar_algoritmos():
-    """Lista los algoritmos disponibles."""
+def armar_lista_algoritmos() -> list:
+    """Descripción de los algoritmos disponibles para /api/algoritmos."""
     algoritmos = []
     
     # Backtracking
-    if load_backtracking():
+    if backtracking_bundle:
         algoritmos.append({
             'id': 'backtracking',
             'nombre': 'Backtracking',
@@ -182,21 +370,39 @@ def listar_algoritmos():
         })
     
     # Branch and Bound
-    if load_branch_and_bound():
+    if branch_and_bound_bundle:
         algoritmos.append({
             'id': 'branch_and_bound',
             'nombre': 'Branch and Bound',
             'descripcion': 'Búsqueda con poda de ramas y heurísticas agresivas'
         })
     
-    return jsonify({
-        "success": True,
-        "algoritmos": algoritmos
-    })
+    return algoritmos
+
+
+# La lista no cambia mientras el servidor está vivo: el cuerpo y su ETag se
+# calculan una sola vez al importar
+_ALGORITMOS_JSON = _CODIFICADOR_JSON.encode({
+    "success": True,
+    "algoritmos": armar_lista_algoritmos()
+}).encode('utf-8')
+_ALGORITMOS_ETAG = hashlib.blake2b(_ALGORITMOS_JSON, digest_size=8).hexdigest()
+
+
+@app.route('/api/algoritmos', methods=['GET'])
+def listar_algoritmos():
+    """
+    Lista los algoritmos disponibles. Responde 304 sin cuerpo si el cliente
+    envía If-None-Match con el ETag vigente.
+    """
+    respuesta = Response(_ALGORITMOS_JSON, mimetype='application/json')
+    respuesta.set_etag(_ALGORITMOS_ETAG)
+    return respuesta.make_conditional(request)
 
 
 @app.route('/api/generar-aleatorio', methods=['POST'])
-def generar_aleatorio():
+@requiere_algoritmo()
+def generar_aleatorio(data: dict, algoritmo: str, bundle: AlgoBundle):
     """
     Genera un estado aleatorio único.
     
@@ -208,67 +414,108 @@ def generar_aleatorio():
         }
     """
     try:
-        data = request.json
-        algoritmo = data.get('algoritmo', 'backtracking')
-        colores_str = data.get('colores', [])
+        colores_str = data.get('colores', ())
         num_colores = data.get('numColores', len(colores_str))
         
         # Convertir a tupla de colores (soporta hasta 15 colores)
-        if not colores_str:
-            COLORES_STANDARD = ['R', 'G', 'B', 'Y', 'O', 'V', 'P', 'C', 'M', 'S', 'L', 'T', 'D', 'A', 'I']
-            colores = tuple(COLORES_STANDARD[:num_colores])
-        else:
-            colores = tuple(colores_str)
-        
-        # Seleccionar módulo según algoritmo
-        if algoritmo == 'backtracking':
-            mod = load_backtracking()
-            if not mod:
-                return jsonify({
-                    "success": False,
-                    "error": "Módulo de backtracking no disponible"
-                }), 500
-        elif algoritmo == 'branch_and_bound':
-            mod = load_branch_and_bound()
-            if not mod:
-                return jsonify({
-                    "success": False,
-                    "error": "Módulo de Branch and Bound no disponible"
-                }), 500
-        else:
-            return jsonify({
-                "success": False,
-                "error": f"Algoritmo '{algoritmo}' no disponible"
-            }), 400
+        colores = tuple(colores_str) or COLORES_STANDARD[:num_colores]
         
         # Generar estado aleatorio único (ambos algoritmos usan la misma función)
-        estado = mod['generar_estado_aleatorio_unico'](colores)
+        estado = bundle.generar(colores)
         
         if estado is None:
-            return jsonify({
-                "success": False,
-                "error": "No se pudo generar un estado único. Intenta de nuevo."
-            }), 400
-        
-        # Convertir a lista para JSON
-        estado_lista = [list(p) for p in estado]
+            return responder_error("No se pudo generar un estado único. Intenta de nuevo.")
         
-        return jsonify({
+        # Las tuplas se serializan como listas JSON, sin copiarlas antes
+        return responder_json({
             "success": True,
-            "estado": estado_lista,
-            "colores": list(colores),
+            "estado": estado,
+            "colores": colores,
             "mensaje": f"Estado aleatorio generado exitosamente"
         })
         
     except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+        return responder_error(str(e), 500)
+
+
+def resolver_solicitud(data: dict, algoritmo: str, bundle: AlgoBundle) -> Tuple[dict, Optional[tuple]]:
+    """
+    Valida y resuelve el cuerpo de /api/resolver.
+    
+    Devuelve (respuesta, solucion): `respuesta` es el resumen (stats,
+    mensaje, ...) sin la lista de movimientos y `solucion` la tupla de
+    movimientos o None. Si la solicitud es inválida o el solver falla
+    lanza ErrorSolicitud.
+    """
+    try:
+        solicitud = leer_solicitud_estado(data, bundle)
+    except ValueError as e:
+        raise ErrorSolicitud(str(e)) from None
+    
+    estado = solicitud.estado
+    colores = solicitud.colores
+    max_expansions = solicitud.max_expansions
+    
+    # Validar estado si tenemos colores
+    if colores:
+        error = validar_cacheado(bundle.validar, estado, colores)
+        if error is not None:
+            raise ErrorSolicitud(f"Estado inválido: {error}")
+    
+    es_branch_and_bound = algoritmo == 'branch_and_bound'
+    
+    if es_branch_and_bound:
+        # Resolver usando Branch and Bound
+        try:
+            solucion, stats = resolver_cacheado(bundle.solve, estado, max_expansions)
+        except Exception as e:
+            logger.exception(f"Error ejecutando Branch and Bound: {e}")
+            raise ErrorSolicitud(f"Error ejecutando Branch and Bound: {str(e)}", 500) from e
+    else:
+        # Resolver usando backtracking
+        solucion, stats = resolver_cacheado(bundle.solve, estado, max_expansions)
+    
+    resuelto = solucion is not None
+    
+    respuesta = {
+        "success": True,
+        "resuelto": resuelto,
+        "stats": {
+            "expanded": stats.expanded,
+            "max_depth": stats.max_depth
+        }
+    }
+    detalle = f"expandidas: {stats.expanded:,}"
+    
+    if es_branch_and_bound:
+        # Convertir math.inf a None para JSON
+        mejor_cota = stats.mejor_cota_encontrada
+        if math.isinf(mejor_cota):
+            mejor_cota = None
+        
+        respuesta["stats"]["pruned"] = stats.pruned
+        respuesta["stats"]["mejor_cota"] = mejor_cota
+        detalle += f", podados: {stats.pruned:,}"
+    
+    if resuelto:
+        num_movimientos = len(solucion)
+        respuesta["num_movimientos"] = num_movimientos
+        respuesta["mensaje"] = f"Solución encontrada en {num_movimientos} movimientos"
+    else:
+        # Distinguir entre límite alcanzado y sin solución
+        if max_expansions and stats.expanded >= max_expansions:
+            respuesta["mensaje"] = f"No se encontró solución: se alcanzó el límite de {max_expansions:,} expansiones ({detalle})"
+            respuesta["limite_alcanzado"] = True
+        else:
+            respuesta["mensaje"] = f"No se encontró solución: el estado puede no tener solución ({detalle})"
+            respuesta["limite_alcanzado"] = False
+    
+    return respuesta, solucion
 
 
 @app.route('/api/resolver', methods=['POST'])
-def resolver():
+@requiere_algoritmo()
+def resolver(data: dict, algoritmo: str, bundle: AlgoBundle):
     """
     Resuelve un estado usando el algoritmo especificado.
     
@@ -281,152 +528,21 @@ def resolver():
         }
     """
     try:
-        data = request.json
-        algoritmo = data.get('algoritmo', 'backtracking')
-        estado_lista = data.get('estado', [])
-        colores_str = data.get('colores', [])
-        max_expansions = data.get('max_expansions', 500000)
-        
-        if not estado_lista:
-            return jsonify({
-                "success": False,
-                "error": "No se proporcionó un estado"
-            }), 400
-        
-        # Convertir a State (tupla de tuplas)
-        estado = tuple(tuple(p) for p in estado_lista)
-        colores = tuple(colores_str) if colores_str else None
-        
-        # Seleccionar módulo según algoritmo
-        if algoritmo == 'backtracking':
-            mod = load_backtracking()
-            if not mod:
-                return jsonify({
-                    "success": False,
-                    "error": "Módulo de backtracking no disponible"
-                }), 500
-            
-            # Validar estado si tenemos colores
-            if colores:
-                try:
-                    mod['validar_instancia_inicial'](estado, colores)
-                except AssertionError as e:
-                    return jsonify({
-                        "success": False,
-                        "error": f"Estado inválido: {str(e)}"
-                    }), 400
-            
-            # Resolver usando backtracking
-            solucion, stats = mod['solve_backtracking'](estado, max_expansions=max_expansions)
-            
-            resuelto = solucion is not None
-            
-            respuesta = {
-                "success": True,
-                "resuelto": resuelto,
-                "stats": {
-                    "expanded": stats.expanded,
-                    "max_depth": stats.max_depth
-                }
-            }
-            
-            if resuelto:
-                respuesta["solucion"] = solucion
-                respuesta["num_movimientos"] = len(solucion)
-                respuesta["mensaje"] = f"Solución encontrada en {len(solucion)} movimientos"
-            else:
-                # Distinguir entre límite alcanzado y sin solución
-                if max_expansions and stats.expanded >= max_expansions:
-                    respuesta["mensaje"] = f"No se encontró solución: se alcanzó el límite de {max_expansions:,} expansiones (expandidas: {stats.expanded:,})"
-                    respuesta["limite_alcanzado"] = True
-                else:
-                    respuesta["mensaje"] = f"No se encontró solución: el estado puede no tener solución (expandidas: {stats.expanded:,})"
-                    respuesta["limite_alcanzado"] = False
-            
-            return jsonify(respuesta)
-            
-        elif algoritmo == 'branch_and_bound':
-            mod = load_branch_and_bound()
-            if not mod:
-                return jsonify({
-                    "success": False,
-                    "error": "Módulo de Branch and Bound no disponible"
-                }), 500
-            
-            # Validar estado si tenemos colores
-            if colores:
-                try:
-                    mod['validar_instancia_inicial'](estado, colores)
-                except AssertionError as e:
-                    return jsonify({
-                        "success": False,
-                        "error": f"Estado inválido: {str(e)}"
-                    }), 400
-            
-            # Resolver usando Branch and Bound
-            try:
-                solucion, stats = mod['solve_branch_and_bound'](estado, max_expansions=max_expansions)
-            except Exception as e:
-                import traceback
-                error_trace = traceback.format_exc()
-                print(f"Error ejecutando Branch and Bound: {e}")
-                print(error_trace)
-                return jsonify({
-                    "success": False,
-                    "error": f"Error ejecutando Branch and Bound: {str(e)}"
-                }), 500
-            
-            resuelto = solucion is not None
-            
-            # Convertir math.inf a None para JSON
-            mejor_cota = getattr(stats, 'mejor_cota_encontrada', None)
-            if mejor_cota is not None and (mejor_cota == float('inf') or mejor_cota == math.inf):
-                mejor_cota = None
-            
-            respuesta = {
-                "success": True,
-                "resuelto": resuelto,
-                "stats": {
-                    "expanded": stats.expanded,
-                    "max_depth": stats.max_depth,
-                    "pruned": getattr(stats, 'pruned', 0),
-                    "mejor_cota": mejor_cota
-                }
-            }
-            
-            if resuelto:
-                respuesta["solucion"] = solucion
-                respuesta["num_movimientos"] = len(solucion)
-                respuesta["mensaje"] = f"Solución encontrada en {len(solucion)} movimientos"
-            else:
-                # Distinguir entre límite alcanzado y sin solución
-                if max_expansions and stats.expanded >= max_expansions:
-                    respuesta["mensaje"] = f"No se encontró solución: se alcanzó el límite de {max_expansions:,} expansiones (expandidas: {stats.expanded:,}, podados: {getattr(stats, 'pruned', 0):,})"
-                    respuesta["limite_alcanzado"] = True
-                else:
-                    respuesta["mensaje"] = f"No se encontró solución: el estado puede no tener solución (expandidas: {stats.expanded:,}, podados: {getattr(stats, 'pruned', 0):,})"
-                    respuesta["limite_alcanzado"] = False
-            
-            return jsonify(respuesta)
-        else:
-            return jsonify({
-                "success": False,
-                "error": f"Algoritmo '{algoritmo}' no disponible"
-            }), 400
+        respuesta, solucion = resolver_solicitud(data, algoritmo, bundle)
+        if solucion is not None:
+            respuesta["solucion"] = solucion
+        return responder_json(respuesta)
         
+    except ErrorSolicitud as e:
+        return responder_error(e.mensaje, e.status)
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"Error general al resolver: {e}")
-        print(error_trace)
-        return jsonify({
-            "success": False,
-            "error": f"Error al resolver: {str(e)}"
-        }), 500
+        logger.exception(f"Error general al resolver: {e}")
+        return responder_error(f"Error al resolver: {str(e)}", 500)
 
 
 @app.route('/api/validar-estado', methods=['POST'])
-def validar_estado():
+@requiere_algoritmo(valido=False)
+def validar_estado(data: dict, algoritmo: str, bundle: AlgoBundle):
     """
     Valida que un estado sea correcto.
     
@@ -438,89 +554,66 @@ def validar_estado():
         }
     """
     try:
-        data = request.json
-        algoritmo = data.get('algoritmo', 'backtracking')
-        estado_lista = data.get('estado', [])
-        colores_str = data.get('colores', [])
-        
-        if not estado_lista:
-            return jsonify({
-                "success": False,
-                "valido": False,
-                "error": "No se proporcionó un estado"
-            }), 400
+        try:
+            solicitud = leer_solicitud_estado(data, bundle)
+        except ValueError as e:
+            return responder_error(str(e), valido=False)
         
-        # Convertir a State
-        estado = tuple(tuple(p) for p in estado_lista)
-        colores = tuple(colores_str) if colores_str else None
-        
-        # Seleccionar módulo según algoritmo
-        if algoritmo == 'backtracking':
-            mod = load_backtracking()
-            if not mod:
-                return jsonify({
-                    "success": False,
-                    "valido": False,
-                    "error": "Módulo de backtracking no disponible"
-                }), 500
-        elif algoritmo == 'branch_and_bound':
-            mod = load_branch_and_bound()
-            if not mod:
-                return jsonify({
-                    "success": False,
-                    "valido": False,
-                    "error": "Módulo de Branch and Bound no disponible"
-                }), 500
-        else:
-            return jsonify({
-                "success": False,
-                "valido": False,
-                "error": f"Algoritmo '{algoritmo}' no disponible"
-            }), 400
+        estado = solicitud.estado
+        colores = solicitud.colores
         
         if not colores:
-            return jsonify({
+            return responder_json({
                 "success": True,
                 "valido": True,
                 "mensaje": "Estado tiene formato correcto (colores no proporcionados para validación completa)"
             })
         
-        try:
-            mod['validar_instancia_inicial'](estado, colores)
-            return jsonify({
-                "success": True,
-                "valido": True,
-                "mensaje": "Estado válido"
-            })
-        except AssertionError as e:
-            return jsonify({
+        error = validar_cacheado(bundle.validar, estado, colores)
+        if error is not None:
+            return responder_json({
                 "success": True,
                 "valido": False,
-                "mensaje": str(e)
+                "mensaje": error
             })
+        return responder_json({
+            "success": True,
+            "valido": True,
+            "mensaje": "Estado válido"
+        })
         
     except Exception as e:
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+        return responder_error(str(e), 500)
+
+
+@app.route('/api/cache/clear', methods=['POST'])
+def limpiar_cache():
+    """Vacía las cachés de resultados y de validaciones de /api/resolver."""
+    resolver_cacheado.cache_clear()
+    validar_cacheado.cache_clear()
+    return responder_json({
+        "success": True,
+        "mensaje": "Caché de resultados vaciada"
+    })
 
 
 if __name__ == '__main__':
     print("=" * 60)
     print("Servidor Flask iniciado")
-    print("Cargando algoritmos disponibles...")
     print("-" * 60)
-    
-    # Intentar cargar ambos algoritmos al inicio
-    bt = load_backtracking()
-    bnb = load_branch_and_bound()
-    
-    print("-" * 60)
-    print(f"Backtracking: {'✓ Disponible' if bt else '✗ No disponible'}")
-    print(f"Branch and Bound: {'✓ Disponible' if bnb else '✗ No disponible'}")
+    print(f"Backtracking: {'✓ Disponible' if backtracking_bundle else '✗ No disponible'}")
+    print(f"Branch and Bound: {'✓ Disponible' if branch_and_bound_bundle else '✗ No disponible'}")
     print("=" * 60)
     print("Abre tu navegador en: http://localhost:5000")
     print("=" * 60)
-    app.run(debug=True, port=5000)
+    # Precalentar los solvers antes de aceptar peticiones (igual que
+    # api/server.py), salvo que se pida omitirlo con SKIP_WARM=1
+    if os.environ.get('SKIP_WARM') != '1':
+        precalentar()
+    
+    # Servidor con un hilo por petición: una resolución larga no bloquea
+    # /api/validar-estado ni /api/generar-aleatorio. El modo debug (recarga
+    # automática y depurador) solo se activa con FLASK_DEBUG=1.
+    debug = os.environ.get('FLASK_DEBUG') == '1'
+    app.run(debug=debug, port=5000, threaded=True)
 